@@ -5,19 +5,24 @@ import yaml
 import queue
 import threading
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import shutil
 import signal
+import logging
+import http.client
+from urllib.parse import urlsplit
 from datetime import datetime, timezone
 from pathlib import Path
-from subprocess import run, CalledProcessError
+from subprocess import run
 from typing import Optional, Tuple, Dict, Any, List
 
 import board, busio
 from adafruit_vl53l0x import VL53L0X
-from gpiozero import LED
+from gpiozero import LED, Button
 from picamera2 import Picamera2
 from picamera2.encoders import H264Encoder, MJPEGEncoder
-from picamera2.outputs import Output  # for custom MJPEG sink
+from picamera2.outputs import Output, FfmpegOutput, CircularOutput  # MJPEG sink; inline MP4 mux; pre-roll ring
 
 # libcamera Transform and controls (AF/AE/AWB)
 try:
@@ -33,7 +38,16 @@ except Exception:
 # ==========
 # Config / Paths
 # ==========
-CFG = yaml.safe_load(open("config.yaml"))
+try:
+    from yaml import CSafeLoader as YamlLoader  # libyaml-backed when available
+except ImportError:
+    from yaml import SafeLoader as YamlLoader
+
+def load_cfg(path: str = "config.yaml") -> dict:
+    with open(path, "r") as f:
+        return yaml.load(f, Loader=YamlLoader) or {}
+
+CFG = load_cfg()
 NODE_ID = CFG["node_id"]
 HUB_URL = CFG["hub_url"].rstrip("/")
 AUTH_TOKEN = CFG["auth_token"]
@@ -144,11 +158,21 @@ EFF_RES, EFF_FPS, EFF_BITRATE_BPS, EFF_ROT_DEG, EFF_PROFILE = _load_effective_vi
 
 REC_RES = EFF_RES
 REC_FPS = EFF_FPS
+# Keyframe interval: profile GOP, else 2s worth of frames for legacy configs
+REC_GOP = int(PROFILES[EFF_PROFILE]["gop"]) if EFF_PROFILE else 2 * REC_FPS
 REC_DUR = int(CFG["recording"]["duration_s"])
+# Seconds of video from *before* the trigger to include (0 = off). The encoder then
+# runs continuously into a RAM ring and a trigger just flushes it to a file.
+try:
+    PRE_ROLL_S = max(0.0, float(CFG["recording"].get("pre_roll_s", 0) or 0))
+except (TypeError, ValueError):
+    PRE_ROLL_S = 0.0
 
 # Sensor thresholds
 THRESH_MM = int(CFG.get("sensor", {}).get("threshold_mm", 1000))
 DEBOUNCE_MS = int(CFG.get("sensor", {}).get("debounce_ms", 200))
+# Extra reads taken after a trigger; a majority must agree before we record
+CONFIRM_SAMPLES = max(0, int(CFG.get("sensor", {}).get("confirm_samples", 4)))
 
 # XSHUT safeguard
 LED_PIN = 27  # status LED (pin 13)
@@ -163,9 +187,21 @@ def _coerce_xshut(cfg: dict) -> Optional[int]:
         return 4
 
 XSHUT_GPIO = _coerce_xshut(CFG)
+
+# Optional: VL53L0X GPIO1 wired to a Pi pin -> sleep on the edge instead of polling
+def _coerce_int_gpio(cfg: dict) -> Optional[int]:
+    raw = cfg.get("sensor", {}).get("interrupt_gpio", None)
+    try:
+        return None if raw is None or str(raw).strip() == "" else int(raw)
+    except Exception:
+        return None
+
+INT_GPIO = _coerce_int_gpio(CFG)
 MIN_FREE_PCT = int(CFG.get("storage", {}).get("min_free_percent", 10))
 
-TMP_DIR = Path("/tmp")
+# Clips are recorded here and uploaded straight from here: keep it on tmpfs (RAM)
+# so a clip never touches the SD card unless its upload fails (-> QUEUE_DIR).
+TMP_DIR = Path(str(CFG.get("clip_tmp_dir") or "/dev/shm/clips"))
 ROOT_DIR = Path.home() / "camera_node"
 QUEUE_DIR = ROOT_DIR / "queue"
 QUEUE_DIR.mkdir(parents=True, exist_ok=True)
@@ -179,8 +215,38 @@ AF_RANGE_STR = str(AF_CFG.get("range", "normal")).lower()  # normal | macro | fu
 AF_SPEED_STR = str(AF_CFG.get("speed", "fast")).lower()    # fast | normal
 AF_ROI = AF_CFG.get("roi_norm", None)  # [x, y, w, h] in 0..1; we’ll bias AF to this window if present
 
+logging.basicConfig(level=logging.INFO, format="%(message)s")  # journald adds its own timestamp
+logger = logging.getLogger("camera_node")
+
 def log(msg):
-    print(msg, flush=True)
+    logger.info(msg)
+
+def _fs_type(path: Path) -> str:
+    """Filesystem type of the mount holding path (longest /proc/mounts prefix)."""
+    best, fstype = "", ""
+    p = str(path.resolve())
+    try:
+        with open("/proc/mounts") as f:
+            for line in f:
+                parts = line.split()
+                if len(parts) >= 3:
+                    mnt = parts[1]
+                    if (p == mnt or p.startswith(mnt.rstrip("/") + "/")) and len(mnt) > len(best):
+                        best, fstype = mnt, parts[2]
+    except OSError:
+        pass
+    return fstype
+
+try:
+    if any(c.isspace() for c in str(TMP_DIR)):
+        # record_clip() hands the clip path to FfmpegOutput, which splits its spec on whitespace
+        raise OSError("path contains whitespace")
+    TMP_DIR.mkdir(parents=True, exist_ok=True)
+except OSError as e:
+    log(f"[CONFIG] clip_tmp_dir {TMP_DIR} unusable ({e}); falling back to /tmp")
+    TMP_DIR = Path("/tmp")
+if _fs_type(TMP_DIR) != "tmpfs":
+    log(f"[CONFIG] WARNING: clip_tmp_dir {TMP_DIR} is not on tmpfs; clips will be written to disk.")
 
 def _af_enum_range():
     if not LCTRLS:
@@ -405,11 +471,20 @@ class LedController:
 # Helpers
 # ==========
 def utc_ts():
-    return datetime.utcnow().strftime("%Y%m%dT%H%M%SZ")
+    return time.strftime("%Y%m%dT%H%M%SZ", time.gmtime())
+
+FREE_SPACE_TTL_SEC = 5.0  # free space barely moves between triggers
+_fs_cache: Dict[str, Tuple[float, float]] = {}  # base -> (monotonic t, pct_free)
 
 def free_space_ok(base="/"):
-    st = os.statvfs(base)
-    pct_free = (st.f_bavail / st.f_blocks) * 100.0 if st.f_blocks else 0.0
+    now = time.monotonic()
+    hit = _fs_cache.get(base)
+    if hit and now - hit[0] < FREE_SPACE_TTL_SEC:
+        pct_free = hit[1]
+    else:
+        st = os.statvfs(base)
+        pct_free = (st.f_bavail / st.f_blocks) * 100.0 if st.f_blocks else 0.0
+        _fs_cache[base] = (now, pct_free)
     return pct_free > MIN_FREE_PCT, pct_free
 
 # ==========
@@ -434,6 +509,49 @@ if XSHUT_GPIO is not None:
 # I2C + sensor
 i2c = busio.I2C(board.SCL, board.SDA)
 sensor = VL53L0X(i2c)
+# Continuous ranging: sensor.range then just reads the latest sample instead of
+# kicking off (and waiting for) a single-shot measurement on every poll.
+SENSOR_POLL_S = 0.02
+try:
+    sensor.measurement_timing_budget = 20000
+    sensor.start_continuous()
+    log("[SENSOR] Continuous ranging (20ms timing budget).")
+except Exception as e:
+    SENSOR_POLL_S = 0.05
+    log(f"[SENSOR] Continuous mode unavailable ({e}); using single-shot reads.")
+
+# Threshold interrupt: GPIO1 goes low (the driver's default polarity) whenever a
+# sample is nearer than THRESH_MM, so the sensor loop can block on the pin.
+def _sensor_write_regs(regs: List[Tuple[int, int, int]]) -> bool:
+    """Write raw VL53L0X registers as (register, value, width in bytes).
+
+    adafruit_vl53l0x exposes no API for the interrupt registers, so this goes
+    through its private _write_u8/_write_u16. Returns False without writing
+    anything if a driver update removed them; the caller then keeps polling.
+    """
+    if not (hasattr(sensor, "_write_u8") and hasattr(sensor, "_write_u16")):
+        return False
+    for reg, val, width in regs:
+        (sensor._write_u16 if width == 2 else sensor._write_u8)(reg, val)
+    return True
+
+trigger_btn: Optional[Button] = None
+if INT_GPIO is not None and SENSOR_POLL_S == 0.02:
+    try:
+        if _sensor_write_regs([
+            (0x0E, max(1, THRESH_MM // 2), 2),  # SYSTEM_THRESH_LOW (units of 2mm)
+            (0x0A, 0x01, 1),                    # SYSTEM_INTERRUPT_CONFIG_GPIO: level low
+            (0x0B, 0x01, 1),                    # SYSTEM_INTERRUPT_CLEAR
+            (0x0B, 0x00, 1),
+        ]):
+            sensor.io_timeout_s = 0.5  # reads now wait for an interrupt; never hang forever
+            trigger_btn = Button(INT_GPIO, pull_up=True)
+            log(f"[SENSOR] Threshold interrupt on GPIO{INT_GPIO} (< {THRESH_MM} mm).")
+        else:
+            log("[SENSOR] Driver has no raw register access; polling instead.")
+    except Exception as e:
+        trigger_btn = None
+        log(f"[SENSOR] Interrupt setup failed ({e}); polling instead.")
 
 # Picamera2 with retry
 def _make_picam2_with_retry(max_tries=6, delay=0.5):
@@ -468,8 +586,9 @@ try:
 except Exception:
     pass
 
-# ---- Disable RAW stream (lighter & safer on IMX708)
-record_config = picam2.create_video_configuration(main={"size": REC_RES}, raw=None, **transform_kw)
+# ---- Disable RAW stream (lighter & safer on IMX708); YUV420 is what the
+# hardware H.264 encoder consumes, so no colour conversion on the way in
+record_config = picam2.create_video_configuration(main={"size": REC_RES, "format": "YUV420"}, raw=None, **transform_kw)
 picam2.configure(record_config)
 if controls:
     try:
@@ -488,22 +607,119 @@ _apply_ae_awb_idle(picam2)
 upload_queue: "queue.Queue[Path]" = queue.Queue()
 stop_event = threading.Event()
 
-def do_upload(file_path: Path) -> bool:
-    url = f"{HUB_URL}/api/v1/clips"
-    headers = {"X-Auth-Token": AUTH_TOKEN}
+# Clip names queued or being uploaded; the retry scanner re-lists QUEUE_DIR every
+# 30s, so without this a hub outage piles up duplicates of the same files.
+_pending: set = set()
+_pending_lock = threading.Lock()
+
+def enqueue_upload(path: Path) -> bool:
+    with _pending_lock:
+        if path.name in _pending:
+            return False
+        _pending.add(path.name)
+    upload_queue.put(path)
+    return True
+
+# One keep-alive session for all uploads: no TCP/TLS handshake per clip.
+# Retry covers connect-level failures (urllib3 does not replay POST bodies on read errors).
+session = requests.Session()
+session.headers["X-Auth-Token"] = AUTH_TOKEN
+session.mount("http://", HTTPAdapter(pool_connections=1, pool_maxsize=4,
+                                  max_retries=Retry(total=3, backoff_factor=0.2)))
+session.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=4,
+                                   max_retries=Retry(total=3, backoff_factor=0.2)))
+
+# Zero-copy path: headers via http.client, body via socket.sendfile() so the clip
+# goes page cache -> socket without passing through Python. Only the uploader
+# thread touches this connection; it is kept alive between clips.
+_UP = urlsplit(f"{HUB_URL}/api/v1/clips")
+_up_conn: Optional[http.client.HTTPConnection] = None
+
+class _ResponseLost(Exception):
+    """The whole body was sent but no response came back; the hub may already have the clip."""
+
+def _sendfile_upload(file_path: Path) -> int:
+    global _up_conn
+    if _up_conn is None:
+        cls = http.client.HTTPSConnection if _UP.scheme == "https" else http.client.HTTPConnection
+        _up_conn = cls(_UP.hostname, _UP.port, timeout=60)
+    body_sent = False
     try:
         with file_path.open("rb") as f:
-            files = {"file": (file_path.name, f, "video/mp4")}
-            r = requests.post(url, headers=headers, files=files, timeout=15)
-        if r.status_code == 200:
-            log(f"[UPLOAD] OK: {file_path.name}")
+            size = os.fstat(f.fileno()).st_size
+            _up_conn.putrequest("POST", _UP.path)
+            _up_conn.putheader("X-Auth-Token", AUTH_TOKEN)
+            _up_conn.putheader("Content-Type", "application/octet-stream")
+            _up_conn.putheader("Content-Length", str(size))
+            _up_conn.putheader("X-Filename", file_path.name)
+            _up_conn.endheaders()
+            _up_conn.sock.sendfile(f)
+        body_sent = True
+        resp = _up_conn.getresponse()
+        resp.read()
+        return resp.status
+    except Exception as e:
+        _up_conn.close()
+        _up_conn = None
+        if body_sent:
+            raise _ResponseLost(str(e) or type(e).__name__) from e
+        raise
+
+def _requests_upload(file_path: Path) -> int:
+    # Raw body streamed from the open file (no multipart encoding pass);
+    # the hub takes the name from X-Filename.
+    with file_path.open("rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        headers = {
+            "Content-Type": "application/octet-stream",
+            "Content-Length": str(size),
+            "X-Filename": file_path.name,
+        }
+        r = session.post(_UP.geturl(), data=f, headers=headers, timeout=(5, 60))
+    return r.status_code
+
+# Seconds to pause the uploader after a transient failure (hub down / 5xx); doubles up to 30
+_backoff = 0.0
+
+# Network-level failures worth backing off for (local errors such as a missing file are not)
+_TRANSIENT_ERRORS = (
+    requests.exceptions.ConnectionError,
+    requests.exceptions.Timeout,
+    ConnectionError,
+    TimeoutError,
+    http.client.HTTPException,
+    _ResponseLost,
+)
+
+def do_upload(file_path: Path) -> bool:
+    global _backoff
+    transient = False
+    try:
+        try:
+            status = _sendfile_upload(file_path)
+        except _ResponseLost:
+            # maybe delivered: don't re-send now; the file stays queued and the hub
+            # keeps a single row if the later retry turns out to be a duplicate
+            raise
+        except Exception as e:
+            # failed before the body went out (stale keep-alive, TLS quirk, ...):
+            # one more go through requests (with Retry)
+            logger.warning("[UPLOAD] sendfile path failed for %s (%s); retrying via requests", file_path.name, e)
+            status = _requests_upload(file_path)
+        if status == 200:
+            _backoff = 0.0
+            logger.info("[UPLOAD] OK: %s", file_path.name)
             return True
-        else:
-            log(f"[UPLOAD] Failed (status {r.status_code}) for {file_path.name}")
-            return False
+        logger.warning("[UPLOAD] Failed (status %s) for %s", status, file_path.name)
+        transient = status >= 500
+        return False
     except Exception as e:
-        log(f"[UPLOAD] Exception for {file_path.name}: {e}")
+        logger.warning("[UPLOAD] Exception for %s: %s", file_path.name, e)
+        transient = isinstance(e, _TRANSIENT_ERRORS)
         return False
+    finally:
+        if transient:
+            _backoff = min(max(_backoff * 2, 1.0), 30.0)
 
 def uploader_thread_fn(led: LedController):
     while not stop_event.is_set():
@@ -512,29 +728,40 @@ def uploader_thread_fn(led: LedController):
         except queue.Empty:
             continue
 
-        ok = do_upload(file_path)
-        if ok:
-            try:
-                file_path.unlink(missing_ok=True)
-            except Exception as e:
-                log(f"[UPLOAD] Cleanup error for {file_path.name}: {e}")
-            # Flip LED back to idle when queue clears (if not LIVE)
-            try:
-                if file_path.parent == QUEUE_DIR and MODE == "RECORD":
-                    if not any(QUEUE_DIR.glob("*.mp4")):
-                        led.set_mode("idle")
-            except Exception as e:
-                log(f"[LED] post-upload check exception: {e}")
-        else:
-            try:
-                QUEUE_DIR.mkdir(parents=True, exist_ok=True)
-                target = QUEUE_DIR / file_path.name
-                if file_path.resolve() != target.resolve():
-                    shutil.move(str(file_path), str(target))
-                log(f"[UPLOAD] Queued for retry: {target.name}")
-            except Exception as e:
-                log(f"[UPLOAD] Failed to move to retry queue: {e}")
-        upload_queue.task_done()
+        try:
+            _upload_one(file_path, led)
+        finally:
+            with _pending_lock:
+                _pending.discard(file_path.name)
+            upload_queue.task_done()
+
+def _upload_one(file_path: Path, led: LedController) -> None:
+    if not file_path.exists():
+        return  # stale entry: already uploaded (and unlinked) or moved
+    ok = do_upload(file_path)
+    if ok:
+        try:
+            file_path.unlink(missing_ok=True)
+        except Exception as e:
+            log(f"[UPLOAD] Cleanup error for {file_path.name}: {e}")
+        # Flip LED back to idle when queue clears (if not LIVE)
+        try:
+            if file_path.parent == QUEUE_DIR and MODE == "RECORD":
+                if not any(QUEUE_DIR.glob("*.mp4")):
+                    led.set_mode("idle")
+        except Exception as e:
+            log(f"[LED] post-upload check exception: {e}")
+    else:
+        try:
+            QUEUE_DIR.mkdir(parents=True, exist_ok=True)
+            target = QUEUE_DIR / file_path.name
+            if file_path.resolve() != target.resolve():
+                shutil.move(str(file_path), str(target))
+            log(f"[UPLOAD] Queued for retry: {target.name}")
+        except Exception as e:
+            log(f"[UPLOAD] Failed to move to retry queue: {e}")
+    if not ok and _backoff:
+        stop_event.wait(_backoff)  # hub unreachable: don't hammer it with the rest of the queue
 
 def retry_scanner_thread_fn(led: LedController):
     while not stop_event.is_set():
@@ -544,7 +771,7 @@ def retry_scanner_thread_fn(led: LedController):
                 if MODE == "RECORD":
                     led.set_mode("error")
                 for p in queued:
-                    upload_queue.put(p)
+                    enqueue_upload(p)
             else:
                 if MODE == "RECORD":
                     led.set_mode("idle")
@@ -582,29 +809,45 @@ def _af_after_clip():
         _af_resume(picam2)
     # 'continuous' and 'manual' remain as-is
 
-def record_clip() -> Path:
-    ts = utc_ts()
-    h264 = TMP_DIR / f"{NODE_ID}_{ts}.h264"
-    mp4 = TMP_DIR / f"{NODE_ID}_{ts}.mp4"
+# V4L2 M2M (VideoCore) encoder; repeat SPS/PPS on every IDR, keyframe every GOP.
+# Built once and reused by every clip: only the output changes per recording.
+ENCODER = H264Encoder(bitrate=EFF_BITRATE_BPS, repeat=True, iperiod=REC_GOP)
 
-    encoder = H264Encoder(bitrate=EFF_BITRATE_BPS) if EFF_BITRATE_BPS else H264Encoder()
+PREROLL: Optional[CircularOutput] = None
 
-    # --- Locks before clip
-    _locks_before_clip(picam2)
-    _af_before_clip()
-
-    picam2.start_recording(encoder, str(h264))
-    time.sleep(REC_DUR)
-    picam2.stop_recording()
+def _start_preroll():
+    """(Re)start continuous encoding into the pre-roll ring; no-op when pre_roll_s is 0."""
+    global PREROLL
+    if PRE_ROLL_S <= 0:
+        return
+    try:
+        PREROLL = CircularOutput(buffersize=max(1, int(REC_FPS * PRE_ROLL_S)))  # size in frames
+        picam2.start_recording(ENCODER, PREROLL)
+        log(f"[RECORD] Pre-roll ring running ({PRE_ROLL_S:g}s).")
+    except Exception as e:
+        PREROLL = None
+        log(f"[RECORD] Pre-roll unavailable ({e}); recording from trigger only.")
 
-    # --- Unlocks after clip
-    _af_after_clip()
-    _locks_after_clip(picam2)
+def _stop_preroll():
+    global PREROLL
+    if PREROLL is None:
+        return
+    try:
+        picam2.stop_recording()
+    except Exception:
+        pass
+    PREROLL = None
 
+def _record_from_preroll(mp4: Path):
+    # The ring holds raw H.264 (no container/timestamps): flush to tmpfs, then remux.
+    h264 = mp4.with_suffix(".h264")
     try:
-        # IMPORTANT: generate PTS and supply input rate to avoid "timestamps unset" warning
+        PREROLL.fileoutput = str(h264)
+        PREROLL.start()
+        time.sleep(REC_DUR)
+        PREROLL.stop()
         run([
-            "ffmpeg", "-y",
+            "ffmpeg", "-y", "-loglevel", "error",
             "-fflags", "+genpts",
             "-r", str(REC_FPS),
             "-i", str(h264),
@@ -612,20 +855,91 @@ def record_clip() -> Path:
             "-c", "copy",
             str(mp4)
         ], check=True)
-    except CalledProcessError as e:
-        log(f"[RECORD] ffmpeg error: {e}")
+    finally:
+        h264.unlink(missing_ok=True)
+
+def record_clip() -> Path:
+    ts = utc_ts()
+    mp4 = TMP_DIR / f"{NODE_ID}_{ts}.mp4"
+
+    # --- Locks before clip
+    _locks_before_clip(picam2)
+    _af_before_clip()
+
+    try:
+        if PREROLL is not None:
+            _record_from_preroll(mp4)
+        else:
+            # Mux straight into MP4 as frames are encoded (stream copy, no .h264 intermediate
+            # and no second ffmpeg pass). FfmpegOutput splits this string into ffmpeg args
+            # on whitespace (no quoting), so the path must not contain any.
+            if any(c.isspace() for c in str(mp4)):
+                raise ValueError(f"clip path contains whitespace: {mp4}")
+            picam2.start_recording(ENCODER, FfmpegOutput(f"-movflags +faststart {mp4}"))
+            time.sleep(REC_DUR)
+            picam2.stop_recording()
+    except Exception as e:
+        log(f"[RECORD] error: {e}")
         try:
-            h264.unlink(missing_ok=True)
+            mp4.unlink(missing_ok=True)
         finally:
             raise
     finally:
-        try:
-            h264.unlink(missing_ok=True)
-        except Exception:
-            pass
+        # --- Unlocks after clip
+        _af_after_clip()
+        _locks_after_clip(picam2)
 
     return mp4
 
+# ==========
+# Recorder Worker (background)
+# ==========
+# Sensor loop -> record_q -> recorder -> upload_queue, so ranging keeps running
+# while a clip is being encoded. Items are trigger times (time.time()); triggers
+# raised while a clip was recording are dropped once it ends, so a follow-up clip
+# is only recorded if the object is still there afterwards (and re-triggers).
+record_q: "queue.Queue[float]" = queue.Queue(maxsize=2)
+
+def recorder_thread_fn(led: LedController):
+    last_clip_end = 0.0
+    while not stop_event.is_set():
+        try:
+            trig_ts = record_q.get(timeout=0.5)
+        except queue.Empty:
+            continue
+
+        try:
+            if trig_ts < last_clip_end:
+                continue  # fired during the previous clip
+            # Hold LIVE_LOCK so the preview cannot reconfigure the camera mid-clip
+            with LIVE_LOCK:
+                if MODE != "RECORD":
+                    continue
+                log("[TRIGGER] Proximity detected; starting recording.")
+                led.set_mode("recording")
+                try:
+                    mp4_path = record_clip()
+                    log(f"[RECORD] Saved: {mp4_path.name}")
+                except Exception as e:
+                    log(f"[RECORD] Exception: {e}")
+                    led.set_mode("error" if any(QUEUE_DIR.glob('*.mp4')) else "idle")
+                    continue
+                finally:
+                    last_clip_end = time.time()
+
+            try:
+                enqueue_upload(mp4_path)
+            except Exception as e:
+                log(f"[QUEUE] Failed to enqueue upload: {e}")
+                try:
+                    shutil.move(str(mp4_path), str(QUEUE_DIR / mp4_path.name))
+                except Exception as e2:
+                    log(f"[QUEUE] Fallback move failed: {e2}")
+
+            led.set_mode("error" if any(QUEUE_DIR.glob('*.mp4')) else "idle")
+        finally:
+            record_q.task_done()
+
 # ==========
 # LIVE preview — HTTP server + MJPEG stream
 # ==========
@@ -696,6 +1010,7 @@ def _enter_live(led: LedController):
     with LIVE_LOCK:
         if MODE == "LIVE":
             return True
+        _stop_preroll()
         try:
             picam2.stop()
         except Exception:
@@ -742,6 +1057,7 @@ def _enter_live(led: LedController):
                 picam2.start()
                 _apply_af_idle(picam2)
                 _apply_ae_awb_idle(picam2)
+                _start_preroll()
             except Exception as e2:
                 log(f"[LIVE] recovery failed: {e2}")
             return False
@@ -774,6 +1090,7 @@ def _exit_live(led: LedController):
             picam2.start()
             _apply_af_idle(picam2)
             _apply_ae_awb_idle(picam2)
+            _start_preroll()
             MODE = "RECORD"
             led.set_mode("error" if any(QUEUE_DIR.glob('*.mp4')) else "idle")
             log("[LIVE] stop")
@@ -793,6 +1110,7 @@ def _exit_live(led: LedController):
                 picam2.start()
                 _apply_af_idle(picam2)
                 _apply_ae_awb_idle(picam2)
+                _start_preroll()
                 MODE = "RECORD"
                 led.set_mode("error" if any(QUEUE_DIR.glob('*.mp4')) else "idle")
                 log("[LIVE] recovered to RECORD")
@@ -906,9 +1224,12 @@ def main():
     LED_GLOBAL = led
 
     # Background workers
+    threading.Thread(target=recorder_thread_fn, args=(led,), daemon=True).start()
     threading.Thread(target=uploader_thread_fn, args=(led,), daemon=True).start()
     threading.Thread(target=retry_scanner_thread_fn, args=(led,), daemon=True).start()
 
+    _start_preroll()
+
     # HTTP server
     threading.Thread(target=http_server_thread, daemon=True).start()
 
@@ -925,6 +1246,10 @@ def main():
                 time.sleep(0.1)
                 continue
 
+            # Interrupt mode: sleep until GPIO1 fires (timeout keeps stop/LIVE checks alive)
+            if trigger_btn is not None and not trigger_btn.wait_for_press(timeout=1.0):
+                continue
+
             try:
                 dist = sensor.range
             except Exception as e:
@@ -943,33 +1268,34 @@ def main():
                         time.sleep(0.2)
                         continue
 
-                    log("[TRIGGER] Proximity detected; starting recording.")
-                    led.set_mode("recording")
-                    try:
-                        mp4_path = record_clip()
-                        log(f"[RECORD] Saved: {mp4_path.name}")
-                    except Exception as e:
-                        log(f"[RECORD] Exception: {e}")
-                        led.set_mode("error" if any(QUEUE_DIR.glob('*.mp4')) else "idle")
+                    # Glitch filter: the triggering read plus CONFIRM_SAMPLES more,
+                    # majority below threshold, before spinning up the encoder
+                    below, samples = 1, 1
+                    for _ in range(CONFIRM_SAMPLES):
+                        time.sleep(SENSOR_POLL_S)
+                        try:
+                            below += sensor.range < THRESH_MM
+                        except Exception:
+                            pass
+                        samples += 1
+                    if below * 2 <= samples:
                         continue
 
                     try:
-                        upload_queue.put(mp4_path)
-                    except Exception as e:
-                        log(f"[QUEUE] Failed to enqueue upload: {e}")
-                        try:
-                            shutil.move(str(mp4_path), str(QUEUE_DIR / mp4_path.name))
-                        except Exception as e2:
-                            log(f"[QUEUE] Fallback move failed: {e2}")
-
-                    led.set_mode("error" if any(QUEUE_DIR.glob('*.mp4')) else "idle")
+                        record_q.put_nowait(time.time())
+                    except queue.Full:
+                        pass  # recorder busy with enough follow-ups queued already
 
-            time.sleep(0.05)
+            time.sleep(SENSOR_POLL_S)
 
     finally:
         led.stop()
         try:
-            if MODE == "LIVE":
+            sensor.stop_continuous()
+        except Exception:
+            pass
+        try:
+            if MODE == "LIVE" or PREROLL is not None:
                 try:
                     picam2.stop_recording()
                 except Exception:
@@ -8,6 +8,7 @@ from heartbeat_config import (
     DB_PATH, NODE_TOKENS, HOST, PORT,
     HEARTBEAT_ONLINE_SEC, HEARTBEAT_STALE_SEC
 )
+from ui_notify import notify_ui
 
 app = Flask(__name__)
 
@@ -117,6 +118,7 @@ def upsert_node(node_id: str, fields: Dict[str, Any]):
             vals = list(fields.values()) + [node_id]
             con.execute(f"UPDATE nodes SET {sets} WHERE {pk}=?;", vals)
         con.commit()
+    notify_ui(DB_PATH)
 
 # ----------- token/auth helpers (DB first, fallback to legacy) -----------
 
@@ -9,6 +9,8 @@ import secrets
 from pathlib import Path
 from werkzeug.utils import secure_filename
 
+from ui_notify import notify_ui
+
 # -------- Config --------
 CFG_PATH = Path(__file__).with_name("config.yaml")
 cfg = yaml.safe_load(open(CFG_PATH)) if CFG_PATH.exists() else {}
@@ -62,6 +64,7 @@ def _ensure_clips_table():
                 timestamp TEXT NOT NULL
             );
         """)
+        db.execute("CREATE INDEX IF NOT EXISTS ix_clips_filepath_nu ON clips(filepath);")
         db.commit()
 
 def _ensure_tokens_table():
@@ -155,6 +158,7 @@ def touch_node(node_id: str, status: str = "online", **kwargs):
         vals = list(fields.values()) + [node_id]
         db.execute(f"UPDATE nodes SET {sets} WHERE node_id=?;", vals)
         db.commit()
+    notify_ui(DB_PATH)
 
 def fetch_nodes():
     with db_conn() as db:
@@ -220,11 +224,18 @@ def ingest_clip():
         touch_node(node, "low_storage")
         return jsonify({"error": "Insufficient storage"}), 507
 
+    # Either multipart (field "file") or a raw application/octet-stream body with
+    # the name in X-Filename; the raw form is streamed to disk without buffering.
     f = request.files.get("file")
-    if not f:
+    if f:
+        fname = secure_filename(f.filename)
+    elif request.mimetype == "application/octet-stream":
+        fname = secure_filename(request.headers.get("X-Filename", ""))
+    else:
+        fname = ""
+    if not fname:
         return "No file", 400
 
-    fname = secure_filename(f.filename)
     date_str = datetime.datetime.utcnow().strftime("%Y%m%d")
 
     # Save under /home/pi/data/<clips_subdir>/<node>/<YYYYMMDD>/<fname>
@@ -232,15 +243,33 @@ def ingest_clip():
     os.makedirs(dst_dir, exist_ok=True)
 
     abs_path = os.path.join(dst_dir, fname)
-    f.save(abs_path)
+    if f:
+        f.save(abs_path)
+    else:
+        tmp_path = abs_path + ".part"
+        try:
+            with open(tmp_path, "wb") as out:
+                shutil.copyfileobj(request.stream, out, 1024 * 1024)
+                received = out.tell()
+            if request.content_length is not None and received != request.content_length:
+                # client went away mid-upload: don't index a truncated clip
+                return "Incomplete upload", 400
+            os.replace(tmp_path, abs_path)
+        finally:
+            try:
+                os.remove(tmp_path)  # only still there if the upload failed
+            except FileNotFoundError:
+                pass
 
     # Store RELATIVE path in DB (relative to STORAGE_BASE)
     rel_path = os.path.relpath(abs_path, STORAGE_BASE)
 
     with db_conn() as db:
+        # A re-upload (retry after a lost response) overwrote the same file; keep one row
         db.execute(
-            "INSERT INTO clips(node_id, filepath, timestamp) VALUES (?,?,?)",
-            (node, rel_path, _utcnow_iso()),
+            "INSERT INTO clips(node_id, filepath, timestamp) SELECT ?,?,? "
+            "WHERE NOT EXISTS (SELECT 1 FROM clips WHERE filepath = ?)",
+            (node, rel_path, _utcnow_iso(), rel_path),
         )
         db.commit()
 
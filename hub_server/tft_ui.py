@@ -5,16 +5,32 @@ import yaml
 import sqlite3
 import tkinter as tk
 from tkinter import messagebox
+from tkinter import font as tkfont
 from datetime import datetime, timezone
 import shutil
 import os
+import time
 import re
 import json
-import urllib.request
-from typing import Optional, Dict, List, Tuple, Set
+import http.client
+import socket
+import threading
+from contextlib import contextmanager
+from typing import Optional, Dict, List, Tuple
+
+from ui_notify import ui_notify_sock
 
 # -------- Config --------
-cfg = yaml.safe_load(open("config.yaml", "r"))
+try:
+    from yaml import CSafeLoader as YamlLoader  # libyaml-backed, much faster than the pure-Python loader
+except ImportError:
+    from yaml import SafeLoader as YamlLoader
+
+def load_cfg(path: str = "config.yaml") -> Dict:
+    with open(path, "r") as f:
+        return yaml.load(f, Loader=YamlLoader) or {}
+
+cfg = load_cfg()
 
 DB_PATH = cfg.get("database", "/home/pi/data/hub.db")
 STORAGE_BASE = cfg.get("storage", {}).get("base_dir", "/home/pi")
@@ -22,15 +38,32 @@ CLIPS_BASE = os.path.join(STORAGE_BASE, "clips")
 MIN_FREE_PCT = float(cfg.get("storage", {}).get("min_free_percent", 10))
 
 # Hub Web API (Flask) — same host, per app.py default
-HUB_API = "http://127.0.0.1:8080"
+HUB_API_HOST = "127.0.0.1"
+HUB_API_PORT = 8080
 
 # Heartbeat thresholds (fallback only; API provides truth)
 HEARTBEAT_ONLINE_SEC = 10
 HEARTBEAT_STALE_SEC = 30
 
 # -------- DB helpers --------
+# One connection for the life of the UI: no per-query open/close or cold page cache.
+_DB = sqlite3.connect(DB_PATH, check_same_thread=False, cached_statements=128)
+_DB.execute("PRAGMA journal_mode=WAL")
+_DB.execute("PRAGMA synchronous=NORMAL")
+_DB.execute("PRAGMA cache_size=-2000")
+_DB.execute("PRAGMA temp_store=MEMORY")
+_DB_LOCK = threading.RLock()
+
+@contextmanager
 def db_conn():
-    return sqlite3.connect(DB_PATH)
+    """Lock the shared connection; commit on success, roll back on error (same as `with sqlite3.connect()`)."""
+    with _DB_LOCK:
+        try:
+            yield _DB
+            _DB.commit()
+        except Exception:
+            _DB.rollback()
+            raise
 
 def table_cols(table: str) -> List[str]:
     with db_conn() as db:
@@ -78,33 +111,88 @@ def build_nodes_select() -> Tuple[str, List[str]]:
 
     return sql, ["node_id","last_seen","ip","version","free_space_pct","queue_len","legacy_status"]
 
+# (schema_version, sql, out_cols): the SELECT only needs rebuilding when a column is added
+_nodes_sql_cache: Dict = {"schema": None, "sql": None, "cols": None}
+
+def nodes_select_cached() -> Tuple[str, List[str]]:
+    with db_conn() as db:
+        schema = db.execute("PRAGMA schema_version").fetchone()[0]
+    if schema != _nodes_sql_cache["schema"]:
+        sql, out_cols = build_nodes_select()
+        _nodes_sql_cache.update(schema=schema, sql=sql, cols=out_cols)
+    return _nodes_sql_cache["sql"], _nodes_sql_cache["cols"]
+
 def fetch_nodes_from_db() -> List[Dict]:
-    sql, out_cols = build_nodes_select()
+    sql, out_cols = nodes_select_cached()
     with db_conn() as db:
         cur = db.cursor()
+        cur.row_factory = lambda _cur, row: dict(zip(out_cols, row))
         cur.execute(sql)
-        rows = cur.fetchall()
-    out = []
-    for r in rows:
-        d = {out_cols[i]: r[i] for i in range(len(out_cols))}
-        out.append(d)
-    return out
+        return cur.fetchall()
+
+# -------- Change detection --------
+_nodes_cache: Dict = {"dv": None, "rows": []}
+
+def db_data_version() -> Optional[int]:
+    """PRAGMA data_version changes whenever another connection commits to the DB."""
+    try:
+        with _DB_LOCK:
+            return _DB.execute("PRAGMA data_version").fetchone()[0]
+    except Exception:
+        return None
+
+def fetch_nodes_cached() -> List[Dict]:
+    """Re-run the nodes SELECT only when the DB changed since the last tick."""
+    dv = db_data_version()
+    if dv is None or dv != _nodes_cache["dv"]:
+        _nodes_cache["rows"] = fetch_nodes_from_db()
+        _nodes_cache["dv"] = dv
+    # callers merge API fields into the dicts, so hand out copies
+    return [dict(r) for r in _nodes_cache["rows"]]
 
 # -------- Storage --------
+FREE_PCT_TTL_SEC = 30.0  # free space moves on the scale of minutes; no need to statvfs every tick
+_free_pct_cache = {"t": 0.0, "v": 0.0}
+
 def free_pct() -> float:
+    now = time.monotonic()
+    if _free_pct_cache["t"] and now - _free_pct_cache["t"] < FREE_PCT_TTL_SEC:
+        return _free_pct_cache["v"]
     total, used, free = shutil.disk_usage(STORAGE_BASE)
-    return (free / total * 100.0) if total else 0.0
+    _free_pct_cache["v"] = (free / total * 100.0) if total else 0.0
+    _free_pct_cache["t"] = now
+    return _free_pct_cache["v"]
 
 # -------- API helpers --------
+_api_conn: Optional[http.client.HTTPConnection] = None  # reused across refresh ticks (keep-alive)
+
+_STALE_CONN_ERRORS = (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError)
+
+def _api_get(path: str) -> Tuple[int, bytes]:
+    global _api_conn
+    if _api_conn is None:
+        _api_conn = http.client.HTTPConnection(HUB_API_HOST, HUB_API_PORT, timeout=4)
+    _api_conn.request("GET", path, headers={"Accept": "application/json"})
+    resp = _api_conn.getresponse()
+    return resp.status, resp.read()
+
 def fetch_api_nodes() -> Optional[Dict[str, Dict]]:
     """
     Returns: { node_id: {status, seconds_ago, last_heartbeat_iso, last_heartbeat, skew_ahead}, ... }
     or None on failure.
     """
-    url = f"{HUB_API}/api/nodes"
+    global _api_conn
     try:
-        with urllib.request.urlopen(url, timeout=4) as resp:
-            data = json.loads(resp.read().decode("utf-8"))
+        try:
+            status, body = _api_get("/api/nodes")
+        except _STALE_CONN_ERRORS:
+            # the server closed the idle keep-alive socket between ticks: reconnect once
+            _api_conn.close()
+            _api_conn = None
+            status, body = _api_get("/api/nodes")
+        if status != 200:
+            return None
+        data = json.loads(body.decode("utf-8"))
         if not data or not data.get("ok"):
             return None
         out = {}
@@ -121,74 +209,97 @@ def fetch_api_nodes() -> Optional[Dict[str, Dict]]:
             }
         return out
     except Exception:
+        # Drop the kept-alive socket; it is re-created on the next tick
+        if _api_conn is not None:
+            _api_conn.close()
+            _api_conn = None
         return None
 
 # -------- Fallback status helpers (if API unavailable) --------
 def parse_iso(iso_str: Optional[str]) -> Optional[datetime]:
     if not iso_str:
         return None
+    if isinstance(iso_str, bytes):
+        iso_str = iso_str.decode("utf-8", "ignore")
+    s = str(iso_str)
+    if len(s) < 19:  # shorter than YYYY-MM-DDTHH:MM:SS can't be a timestamp
+        return None
     try:
-        if isinstance(iso_str, bytes):
-            iso_str = iso_str.decode("utf-8", "ignore")
-        s = str(iso_str)
         if s.endswith("Z"):
             try:
                 return datetime.strptime(s, "%Y-%m-%dT%H:%M:%S.%fZ").replace(tzinfo=timezone.utc)
             except ValueError:
                 return datetime.strptime(s, "%Y-%m-%dT%H:%M:%SZ").replace(tzinfo=timezone.utc)
         dt = datetime.fromisoformat(s)
-        if dt.tzinfo is None:
-            dt = dt.replace(tzinfo=timezone.utc)
-        return dt
-    except Exception:
+    except ValueError:
         return None
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt
+
+# last_seen string -> parsed datetime; a node's value only changes on heartbeat
+_parsed_iso_cache: Dict[str, Optional[datetime]] = {}
 
-def computed_status_fallback(last_seen_iso: Optional[str]) -> str:
-    dt = parse_iso(last_seen_iso)
+def computed_status_fallback(last_seen_iso: Optional[str], now: datetime,
+                             cache: Dict[str, Optional[datetime]] = _parsed_iso_cache) -> str:
+    if not last_seen_iso:
+        return "offline"
+    try:
+        dt = cache[last_seen_iso]
+    except KeyError:
+        if len(cache) > 1024:  # stale heartbeats pile up; start over rather than grow
+            cache.clear()
+        dt = cache[last_seen_iso] = parse_iso(last_seen_iso)
     if not dt:
         return "offline"
-    delta = (datetime.now(timezone.utc) - dt).total_seconds()
+    delta = (now - dt).total_seconds()
     if delta <= HEARTBEAT_ONLINE_SEC:
         return "online"
     if delta <= HEARTBEAT_STALE_SEC:
         return "stale"
     return "offline"
 
+_STATUS_COLOR = {
+    "online": "#16a34a",   # green
+    "stale": "#f59e0b",    # yellow
+    "offline": "#dc2626",  # red
+}
+
 def status_color(status: str) -> str:
-    if status == "online":
-        return "#16a34a"  # green
-    if status == "stale":
-        return "#f59e0b"  # yellow
-    return "#dc2626"      # red
+    return _STATUS_COLOR.get(status, "#dc2626")
 
 # -------- Clip utilities (reindex/prune) --------
-FN_TS_RE = re.compile(r".*?(\d{8}T\d{6})Z", re.I)
+# Pre-split groups so a match formats straight to ISO; re.A keeps \d to ASCII digits.
+_TS_RE = re.compile(r"(\d{4})(\d{2})(\d{2})T(\d{2})(\d{2})(\d{2})Z", re.A | re.I)
 
 def ts_from_filename(fn: str) -> Optional[str]:
-    m = FN_TS_RE.match(fn)
+    m = _TS_RE.search(fn)
     if not m:
         return None
-    raw = m.group(1)  # YYYYMMDDTHHMMSS
     try:
-        dt = datetime.strptime(raw, "%Y%m%dT%H%M%S").replace(tzinfo=timezone.utc)
-        return dt.strftime("%Y-%m-%dT%H:%M:%SZ")
-    except Exception:
+        datetime(*map(int, m.groups()))  # rejects impossible dates (e.g. Feb 31) like strptime did
+    except ValueError:
         return None
+    return f"{m[1]}-{m[2]}-{m[3]}T{m[4]}:{m[5]}:{m[6]}Z"
 
-def load_existing_paths() -> Tuple[str, Set[str]]:# noqa
+def clips_path_mode() -> str:
+    """
+    Returns 'legacy' (filepath), 'new' (rel_path) or 'unknown', and makes sure the
+    dedup column is indexed so reindex can probe it instead of loading every row.
+    """
     cols = set(table_cols("clips"))
     if "filepath" in cols:
-        with db_conn() as db:
-            cur = db.cursor()
-            cur.execute("SELECT filepath FROM clips")
-            return "legacy", {row[0] for row in cur.fetchall() if row and row[0]}
+        mode, col = "legacy", "filepath"
     elif "rel_path" in cols:
-        with db_conn() as db:
-            cur = db.cursor()
-            cur.execute("SELECT rel_path FROM clips")
-            return "new", {row[0] for row in cur.fetchall() if row and row[0]}
+        mode, col = "new", "rel_path"
     else:
-        return "unknown", set()
+        return "unknown"
+    with db_conn() as db:
+        # Plain index: server.py ingest inserts re-uploads too, so a UNIQUE one would
+        # turn those into 500s. The NOT EXISTS probe in reindex does the dedup.
+        db.execute(f"DROP INDEX IF EXISTS ix_clips_{col}")  # unique variant from older builds
+        db.execute(f"CREATE INDEX IF NOT EXISTS ix_clips_{col}_nu ON clips({col})")
+    return mode
 
 def prune_db():
     removed = 0
@@ -210,18 +321,42 @@ def prune_db():
         db.commit()
     toast(f"Pruned {removed} records", "lime")
 
+REINDEX_BATCH = 200  # rows per write transaction during reindex
+
 def reindex_db():
     if not os.path.isdir(CLIPS_BASE):
         toast("No clips directory found", "orange")
         return
 
-    mode, existing = load_existing_paths()
+    mode = clips_path_mode()
     if mode == "unknown":
         toast("clips table not recognized", "red")
         return
 
+    if mode == "legacy":
+        insert_sql = ("INSERT INTO clips (node_id, filepath, timestamp) SELECT ?,?,? "
+                      "WHERE NOT EXISTS (SELECT 1 FROM clips WHERE filepath = ?)")
+    else:
+        insert_sql = ("INSERT INTO clips (node_id, rel_path, created_at, bytes, status) SELECT ?,?,?,?,? "
+                      "WHERE NOT EXISTS (SELECT 1 FROM clips WHERE rel_path = ?)")
+
     inserted = 0
     errors = 0
+    batch: List[tuple] = []
+
+    def flush():
+        # Short write transactions, so heartbeat/ingest writers aren't locked out for the whole walk
+        nonlocal inserted, errors
+        with db_conn() as db:
+            cur = db.cursor()
+            for params in batch:
+                try:
+                    cur.execute(insert_sql, params)
+                    inserted += cur.rowcount if cur.rowcount > 0 else 0
+                except Exception:
+                    errors += 1
+        batch.clear()
+
     for node_id in sorted(os.listdir(CLIPS_BASE)):
         node_dir = os.path.join(CLIPS_BASE, node_id)
         if not os.path.isdir(node_dir):
@@ -236,10 +371,6 @@ def reindex_db():
                 abs_path = os.path.join(day_dir, fn)
                 rel_path = os.path.relpath(abs_path, STORAGE_BASE)  # e.g. clips/cam01/...
 
-                key = abs_path if mode == "legacy" else rel_path
-                if key in existing:
-                    continue
-
                 ts = ts_from_filename(fn)
                 if not ts:
                     try:
@@ -249,29 +380,19 @@ def reindex_db():
                     except Exception:
                         ts = None
 
-                try:
-                    with db_conn() as db:
-                        cur = db.cursor()
-                        if mode == "legacy":
-                            cur.execute(
-                                "INSERT INTO clips (node_id, filepath, timestamp) VALUES (?,?,?)",
-                                (node_id, abs_path, ts)
-                            )
-                        else:
-                            size_b = None
-                            try:
-                                size_b = os.path.getsize(abs_path)
-                            except Exception:
-                                pass
-                            cur.execute(
-                                "INSERT INTO clips (node_id, rel_path, created_at, bytes, status) VALUES (?,?,?,?,?)",
-                                (node_id, rel_path, ts, size_b, "stored")
-                            )
-                        db.commit()
-                        inserted += 1
-                        existing.add(key)
-                except Exception:
-                    errors += 1
+                if mode == "legacy":
+                    batch.append((node_id, abs_path, ts, abs_path))
+                else:
+                    size_b = None
+                    try:
+                        size_b = os.path.getsize(abs_path)
+                    except Exception:
+                        pass
+                    batch.append((node_id, rel_path, ts, size_b, "stored", rel_path))
+                if len(batch) >= REINDEX_BATCH:
+                    flush()
+    if batch:
+        flush()
 
     color = "lime" if errors == 0 else "#f59e0b"
     toast(f"Reindex complete: {inserted} added, {errors} errors", color)
@@ -281,14 +402,22 @@ def clean_all_files():
         toast("Clean canceled", "#bbbbbb")
         return
 
-    deleted = 0
-    for rootdir, dirs, files in os.walk(CLIPS_BASE):
-        for f in files:
-            try:
-                os.remove(os.path.join(rootdir, f))
-                deleted += 1
-            except Exception:
-                pass
+    # Drop whole per-node trees in one rmtree each rather than unlinking file by file
+    cleared = 0
+    try:
+        with os.scandir(CLIPS_BASE) as it:
+            entries = list(it)
+    except FileNotFoundError:
+        entries = []
+    for entry in entries:
+        try:
+            if entry.is_dir(follow_symlinks=False):
+                shutil.rmtree(entry.path, ignore_errors=True)
+            else:
+                os.remove(entry.path)
+            cleared += 1
+        except Exception:
+            pass
 
     try:
         with db_conn() as db:
@@ -298,46 +427,54 @@ def clean_all_files():
         toast(f"DB clean error: {e}", "red")
         return
 
-    toast(f"Deleted {deleted} files; DB cleared", "lime")
+    toast(f"Cleared {cleared} clip folders/files; DB cleared", "lime")
 
 # -------- UI --------
 root = tk.Tk()
 root.attributes("-fullscreen", True)
 root.configure(bg="black")
 
+# Shared fonts: created once so Tk doesn't re-parse a font spec per widget
+F_TITLE   = tkfont.Font(root=root, family="Arial", size=24, weight="bold")
+F_NODE_ID = tkfont.Font(root=root, family="Arial", size=18, weight="bold")
+F_BANNER  = tkfont.Font(root=root, family="Arial", size=16)
+F_BUTTON  = tkfont.Font(root=root, family="Arial", size=14, weight="bold")
+F_CHIP    = tkfont.Font(root=root, family="Arial", size=12, weight="bold")
+F_DETAILS = tkfont.Font(root=root, family="Arial", size=12)
+
 def toast(msg: str, color: str = "white", timeout_ms: int = 2500):
     toast_label.config(text=msg, fg=color)
     if timeout_ms:
         root.after(timeout_ms, lambda: toast_label.config(text=""))
 
-title = tk.Label(root, text="Hub Server Status", font=("Arial", 24, "bold"), fg="white", bg="black")
+title = tk.Label(root, text="Hub Server Status", font=F_TITLE, fg="white", bg="black")
 title.pack(pady=(6, 2))
 
-toast_label = tk.Label(root, text="", font=("Arial", 12), fg="white", bg="black")
+toast_label = tk.Label(root, text="", font=F_DETAILS, fg="white", bg="black")
 toast_label.pack(pady=(0, 4))
 
-storage_label = tk.Label(root, text="", font=("Arial", 16), fg="white", bg="black")
+storage_label = tk.Label(root, text="", font=F_BANNER, fg="white", bg="black")
 storage_label.pack(pady=(0, 6))
 
 controls = tk.Frame(root, bg="black")
 controls.pack(fill="x", padx=10, pady=(2, 6))
 
 btn_prune = tk.Button(
-    controls, text="Prune DB", font=("Arial", 14, "bold"),
+    controls, text="Prune DB", font=F_BUTTON,
     fg="white", bg="#2563eb", activebackground="#1e40af",
     padx=12, pady=6, command=prune_db
 )
 btn_prune.pack(side="left", padx=(0, 8))
 
 btn_reindex = tk.Button(
-    controls, text="Reindex DB", font=("Arial", 14, "bold"),
+    controls, text="Reindex DB", font=F_BUTTON,
     fg="white", bg="#0ea5e9", activebackground="#0284c7",
     padx=12, pady=6, command=reindex_db
 )
 btn_reindex.pack(side="left", padx=(0, 8))
 
 btn_clean = tk.Button(
-    controls, text="Clean All Files…", font=("Arial", 14, "bold"),
+    controls, text="Clean All Files…", font=F_BUTTON,
     fg="white", bg="#dc2626", activebackground="#991b1b",
     padx=12, pady=6, command=clean_all_files
 )
@@ -355,6 +492,7 @@ vbar.pack(side="right", fill="y")
 
 nodes_frame = tk.Frame(canvas, bg="black")
 nodes_window_id = canvas.create_window((0, 0), window=nodes_frame, anchor="nw")
+msg_label = tk.Label(nodes_frame, font=F_BANNER, fg="gray", bg="black")  # packed on demand
 
 def _on_nodes_frame_configure(event):
     canvas.configure(scrollregion=canvas.bbox("all"))
@@ -387,10 +525,32 @@ canvas.bind_all("<Button-5>", _on_mousewheel)
 canvas.bind("<Button-1>", _on_drag_start)
 canvas.bind("<B1-Motion>", _on_drag_move)
 
-footer = tk.Label(root, text="/api/v1/heartbeat · /api/v1/clips", font=("Arial", 12), fg="#888", bg="black")
+footer = tk.Label(root, text="/api/v1/heartbeat · /api/v1/clips", font=F_DETAILS, fg="#888", bg="black")
 footer.pack(pady=(0, 6))
 
-def render_node_row(parent, node: Dict):
+# Row widgets are created once and recycled: refresh() only reconfigures text/colours
+# and pack_forget()s surplus rows, so Tk never churns through destroy/create.
+_row_pool: List[Dict] = []
+
+def make_node_row(parent) -> Dict:
+    row = tk.Frame(parent, bg="black")
+
+    top_line = tk.Frame(row, bg="black")
+    top_line.pack(anchor="w", fill="x")
+
+    id_label = tk.Label(top_line, font=F_NODE_ID, fg="white", bg="black")
+    id_label.pack(side="left", padx=(0, 10))
+
+    chip = tk.Label(top_line, font=F_CHIP, fg="white", padx=8, pady=2)
+    chip.pack(side="left")
+
+    det_label = tk.Label(row, font=F_DETAILS, fg="#bbbbbb", bg="black",
+                         wraplength=460, justify="left")
+    det_label.pack(anchor="w", pady=(3, 0))
+
+    return {"row": row, "id": id_label, "chip": chip, "details": det_label, "shown": False, "key": None}
+
+def render_node_row(w: Dict, node: Dict):
     node_id = node.get("node_id") or "—"
     ip = node.get("ip")
     version = node.get("version")
@@ -402,19 +562,6 @@ def render_node_row(parent, node: Dict):
     last_iso = node.get("last_heartbeat_iso") or "—"
     color = status_color(stat)
 
-    row = tk.Frame(parent, bg="black")
-    row.pack(anchor="w", fill="x", padx=2, pady=3)
-
-    top_line = tk.Frame(row, bg="black")
-    top_line.pack(anchor="w", fill="x")
-
-    id_label = tk.Label(top_line, text=f"{node_id}", font=("Arial", 18, "bold"), fg="white", bg="black")
-    id_label.pack(side="left", padx=(0, 10))
-
-    chip = tk.Label(top_line, text=stat.upper(), font=("Arial", 12, "bold"),
-                    fg="white", bg=color, padx=8, pady=2)
-    chip.pack(side="left")
-
     details = []
     details.append(f"Last: {last_iso}")
     if ip: details.append(f"IP: {ip}")
@@ -430,49 +577,132 @@ def render_node_row(parent, node: Dict):
     except Exception:
         pass
 
-    det_label = tk.Label(row, text="   ·   ".join(details), font=("Arial", 12), fg="#bbbbbb", bg="black",
-                         wraplength=460, justify="left")
-    det_label.pack(anchor="w", pady=(3, 0))
+    w["id"].config(text=f"{node_id}")
+    w["chip"].config(text=stat.upper(), bg=color)
+    w["details"].config(text="   ·   ".join(details))
+
+def show_rows(nodes: List[Dict]):
+    """Render nodes into the pooled rows; only a prefix of the pool is ever packed."""
+    while len(_row_pool) < len(nodes):
+        _row_pool.append(make_node_row(nodes_frame))
+    for i, w in enumerate(_row_pool):
+        if i < len(nodes):
+            key = node_render_key(nodes[i])
+            if key != w["key"]:  # only touch Tk for rows whose visible state changed
+                render_node_row(w, nodes[i])
+                w["key"] = key
+            if not w["shown"]:
+                w["row"].pack(anchor="w", fill="x", padx=2, pady=3)
+                w["shown"] = True
+        elif w["shown"]:
+            w["row"].pack_forget()
+            w["shown"] = False
+
+def show_message(text: Optional[str], fg: str = "gray"):
+    """Single reusable label for 'no nodes' / DB errors; None hides it."""
+    if text is None:
+        msg_label.pack_forget()
+    else:
+        msg_label.config(text=text, fg=fg)
+        msg_label.pack(anchor="w")
+
+def node_render_key(node: Dict) -> Tuple:
+    """The fields render_node_row actually shows; seconds_ago etc. are ignored."""
+    return (node.get("node_id"), node.get("status"), node.get("last_heartbeat_iso"),
+            node.get("ip"), node.get("version"), node.get("free_space_pct"), node.get("queue_len"))
+
+_last_render: Dict = {"storage": None, "nodes": None}
+
+# -------- Change notifications --------
+# hub-api/heartbeatd send a datagram to this socket after every nodes write, so a
+# heartbeat repaints within ~100ms and the timer only has to catch online -> stale
+# -> offline ageing (no write happens then); without the socket, poll as before.
+UI_NOTIFY_SOCK = ui_notify_sock(DB_PATH)
+POLL_MS = 2000
+_refresh_job: Dict = {"id": None, "event": False}
+
+def schedule_refresh(delay_ms: int):
+    if _refresh_job["id"] is not None:
+        root.after_cancel(_refresh_job["id"])
+    _refresh_job["id"] = root.after(delay_ms, _run_refresh)
+
+def _run_refresh():
+    _refresh_job["id"] = None
+    _refresh_job["event"] = False
+    refresh()
+
+def _on_notify(_fd, _mask):
+    try:
+        while _notify_sock.recv(64):  # drain a burst; one refresh covers it
+            pass
+    except BlockingIOError:
+        pass
+    if not _refresh_job["event"]:  # don't keep pushing an already-queued refresh back
+        _refresh_job["event"] = True
+        schedule_refresh(100)
+
+try:
+    try:
+        os.unlink(UI_NOTIFY_SOCK)  # stale from a previous run
+    except FileNotFoundError:
+        pass
+    _notify_sock = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+    _notify_sock.bind(UI_NOTIFY_SOCK)
+    _notify_sock.setblocking(False)
+    root.tk.createfilehandler(_notify_sock, tk.READABLE, _on_notify)
+    POLL_MS = 5000
+except (OSError, AttributeError):
+    pass  # no notify socket: keep the fast POLL_MS poll
 
 def refresh():
     # Storage banner
     pct = free_pct()
     if pct < MIN_FREE_PCT:
-        storage_label.config(text=f"⚠ LOW STORAGE: {pct:.1f}% free", fg="red")
+        banner = (f"⚠ LOW STORAGE: {pct:.1f}% free", "red")
     else:
-        storage_label.config(text=f"Storage OK: {pct:.1f}% free", fg="lime")
-
-    # Clear existing node rows
-    for w in nodes_frame.winfo_children():
-        w.destroy()
+        banner = (f"Storage OK: {pct:.1f}% free", "lime")
+    if banner != _last_render["storage"]:
+        storage_label.config(text=banner[0], fg=banner[1])
+        _last_render["storage"] = banner
 
     # Fetch unified status from API
     api_map = fetch_api_nodes()  # None on failure
 
     # Fetch DB rows (for supplemental info)
     try:
-        rows = fetch_nodes_from_db()
+        rows = fetch_nodes_cached()
     except Exception as e:
-        tk.Label(nodes_frame, text=f"DB error: {e}", font=("Arial", 16), fg="red", bg="black").pack(anchor="w")
-        root.after(2000, refresh)
+        sig = ("error", str(e))
+        if sig != _last_render["nodes"]:
+            show_rows([])
+            show_message(f"DB error: {e}", fg="red")
+            _last_render["nodes"] = sig
+        schedule_refresh(POLL_MS)
         return
 
     # Merge: DB list is authoritative for which nodes to show (preserve extra data)
-    if not rows:
-        tk.Label(nodes_frame, text="No nodes registered yet…", font=("Arial", 16), fg="gray", bg="black").pack(anchor="w")
-    else:
-        for node in rows:
-            nid = str(node.get("node_id") or "")
-            if api_map and nid in api_map:
-                node.update(api_map[nid])  # adds status, last_heartbeat_iso, etc.
-            else:
-                # Fallback: compute status from DB's last_seen if API missing/unavailable
-                node["status"] = computed_status_fallback(node.get("last_seen"))
-                node["last_heartbeat_iso"] = node.get("last_seen") or "—"
-                node["skew_ahead"] = 0
-            render_node_row(nodes_frame, node)
+    now = datetime.now(timezone.utc)  # one clock read per tick, shared by every row
+    for node in rows:
+        nid = str(node.get("node_id") or "")
+        if api_map and nid in api_map:
+            node.update(api_map[nid])  # adds status, last_heartbeat_iso, etc.
+        else:
+            # Fallback: compute status from DB's last_seen if API missing/unavailable
+            node["status"] = computed_status_fallback(node.get("last_seen"), now)
+            node["last_heartbeat_iso"] = node.get("last_seen") or "—"
+            node["skew_ahead"] = 0
+
+    # Nothing visible changed (statuses are recomputed above, so transitions still land): skip Tk work
+    sig = ("rows", tuple(node_render_key(n) for n in rows))
+    if sig == _last_render["nodes"]:
+        schedule_refresh(POLL_MS)
+        return
+    _last_render["nodes"] = sig
+
+    show_rows(rows)
+    show_message(None if rows else "No nodes registered yet…")
 
-    root.after(2000, refresh)
+    schedule_refresh(POLL_MS)
 
 def on_key(event):
     if event.keysym == "Escape":
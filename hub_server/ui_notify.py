@@ -0,0 +1,17 @@
+import os
+import socket
+
+# TFT UI listens on a datagram socket next to the hub DB and refreshes when
+# pinged; sends are fire-and-forget (no listener -> ENOENT/ECONNREFUSED, ignored).
+
+def ui_notify_sock(db_path: str) -> str:
+    return os.path.join(os.path.dirname(db_path), "hub-ui.sock")
+
+_notify = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+_notify.setblocking(False)
+
+def notify_ui(db_path: str) -> None:
+    try:
+        _notify.sendto(b"1", ui_notify_sock(db_path))
+    except OSError:
+        pass
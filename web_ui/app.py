@@ -5,38 +5,78 @@ import os
 import sqlite3
 import subprocess
 import re
-import tempfile
+import shlex
 import json as pyjson
+import copy
+import csv
+import io
 import urllib.request
 import urllib.error
 import socket
 import time
+import unicodedata
 import shutil
+import hashlib
+import heapq
+import threading
+import atexit
+import fcntl
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from functools import lru_cache
 from datetime import datetime, timezone, timedelta
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple
 
 import yaml
+try:
+    from yaml import CSafeLoader as YamlLoader, CSafeDumper as YamlDumper  # libyaml-backed when available
+except ImportError:
+    from yaml import SafeLoader as YamlLoader, SafeDumper as YamlDumper
 from flask import (
     Flask, jsonify, render_template, abort, Response,
-    request, make_response, send_file
+    request, make_response, send_file, stream_with_context
 )
 from zoneinfo import ZoneInfo
 
+from cfg_cache import load_yaml_cached
+
+try:  # optional: faster JSON encoding for the polled/action endpoints
+    import orjson
+except ImportError:
+    orjson = None
+
+try:  # optional: instant clips_index updates; without it the index is re-synced by polling
+    from watchdog.observers import Observer
+    from watchdog.events import FileSystemEventHandler
+except ImportError:
+    Observer = None
+    FileSystemEventHandler = object
+
 APP_DIR = Path(__file__).resolve().parent
 
 # ---------- Load hub_server/config.yaml ----------
 DEFAULT_HUB_CFG = Path.home() / "hub_server" / "config.yaml"
 HUB_CFG_PATH = Path(os.environ.get("HUB_SERVER_CONFIG", str(DEFAULT_HUB_CFG)))
 
+# Parsed config (+ rendered YAML texts, filled lazily) for the current file
+# version; re-parsed only when (mtime_ns, size) changes. Treat "cfg" as read-only.
+_CFG_CACHE: Dict[str, Any] = {"key": None, "cfg": None, "raw_text": None,
+                               "redacted_text": None}
+
 def load_hub_cfg() -> dict:
-    if not HUB_CFG_PATH.exists():
+    try:
+        st = os.stat(HUB_CFG_PATH)
+    except FileNotFoundError:
         raise FileNotFoundError(
             f"Hub config not found at {HUB_CFG_PATH}. "
             f"Set HUB_SERVER_CONFIG if it lives elsewhere."
-        )
-    with open(HUB_CFG_PATH, "r") as f:
-        return yaml.safe_load(f) or {}
+        ) from None
+    key = (st.st_mtime_ns, st.st_size)
+    if _CFG_CACHE["key"] != key:
+        cfg = load_yaml_cached(HUB_CFG_PATH)
+        _CFG_CACHE.update(key=key, cfg=cfg, raw_text=None, redacted_text=None)
+    return _CFG_CACHE["cfg"]
 
 hub_cfg = load_hub_cfg()
 
@@ -49,6 +89,7 @@ base_dir = storage.get("base_dir", "/home/pi/data")
 clips_subdir = storage.get("clips_subdir", "clips")
 CLIPS_DIR = Path(base_dir) / clips_subdir
 MIN_FREE_PCT = float(storage.get("min_free_percent", 10))
+_CLIPS_BASE = CLIPS_DIR.resolve()  # containment root for download/thumb/delete checks
 
 HB_ONLINE = int(os.environ.get("HB_ONLINE_SEC", "10"))
 HB_STALE  = int(os.environ.get("HB_STALE_SEC", "30"))
@@ -90,22 +131,64 @@ PROFILES: Dict[str, Dict[str, Any]] = {
 }
 DEFAULT_PROFILE = "storage_saver_720p30"
 
+# name -> (resolution, fps, default_kbps, lo_kbps, hi_kbps), built once at import
+_PROFILE_INDEX: Dict[str, Tuple[str, int, int, int, int]] = {
+    name: (p["resolution"], int(p["fps"]), int(p["default_bitrate_kbps"]),
+           int(p["recommended_bitrate_kbps"][0]), int(p["recommended_bitrate_kbps"][1]))
+    for name, p in PROFILES.items()
+}
+
+def _canon(s: Optional[str]) -> str:
+    """Case/width-insensitive key for matching resolution strings (e.g. "１９２０Ｘ1080")."""
+    s = s or ""
+    if s.isascii():
+        return s.lower().strip()
+    if not unicodedata.is_normalized("NFKC", s):
+        s = unicodedata.normalize("NFKC", s)
+    return s.casefold().strip()
+
+# ("1920x1080", 30) -> profile name; the first profile in PROFILES order wins
+# when several share a resolution/fps (matches the old linear scan).
+_LEGACY_TO_PROFILE: Dict[Tuple[str, int], str] = {}
+for _name, _p in PROFILES.items():
+    _LEGACY_TO_PROFILE.setdefault((_canon(_p["resolution"]), int(_p["fps"])), _name)
+del _name, _p
+
 def _profile_to_res_fps(profile: str) -> Tuple[str, int]:
-    p = PROFILES.get(profile) or PROFILES[DEFAULT_PROFILE]
-    return p["resolution"], int(p["fps"])
+    p = _PROFILE_INDEX.get(profile) or _PROFILE_INDEX[DEFAULT_PROFILE]
+    return p[0], p[1]
 
 def _clamp_bitrate_for_profile(profile: str, br: Optional[int]) -> int:
-    p = PROFILES.get(profile) or PROFILES[DEFAULT_PROFILE]
-    default_br = int(p["default_bitrate_kbps"])
-    lo, hi = [int(x) for x in p["recommended_bitrate_kbps"]]
+    _, _, default_br, lo, hi = _PROFILE_INDEX.get(profile) or _PROFILE_INDEX[DEFAULT_PROFILE]
     if br is None:
         return default_br
-    try:
-        br = int(br)
-    except Exception:
-        return default_br
+    if not isinstance(br, int):
+        try:
+            br = int(br)
+        except (TypeError, ValueError):
+            return default_br
     return max(lo, min(hi, br))
 
+def ojsonify(obj: Any) -> Response:
+    """jsonify() replacement that encodes with orjson when it is installed."""
+    if orjson is None:
+        return jsonify(obj)
+    return Response(orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS), mimetype="application/json")
+
+_VALID_ROT = frozenset((0, 90, 180, 270))
+
+def _coerce_int(v: Any, default: Any, lo: Optional[int] = None, hi: Optional[int] = None) -> Any:
+    """int(v) clamped to [lo, hi]; default when v is None or not a number."""
+    try:
+        n = int(v)
+    except (TypeError, ValueError):
+        return default
+    if lo is not None:
+        n = max(lo, n)
+    if hi is not None:
+        n = min(hi, n)
+    return n
+
 # Pass auth badge (if any) from Nginx basic auth
 @app.context_processor
 def inject_admin_user():
@@ -114,36 +197,83 @@ def inject_admin_user():
 
 # -------------------- DB helpers --------------------
 
-def db_conn():
-    return sqlite3.connect(DB_PATH)
+# One connection per worker thread, opened once (no per-request open of db/-wal/-shm).
+# WAL lets readers run alongside the hub-api/heartbeatd writers; busy_timeout waits
+# out their locks instead of failing with "database is locked".
+_tls = threading.local()
+_ALL_CONNS: List[sqlite3.Connection] = []
+_CONNS_LOCK = threading.Lock()
+_WRITE_LOCK = threading.RLock()
+
+def db_conn() -> sqlite3.Connection:
+    con = getattr(_tls, "con", None)
+    if con is None:
+        con = sqlite3.connect(DB_PATH, timeout=5.0, cached_statements=256)
+        con.execute("PRAGMA journal_mode=WAL")
+        con.execute("PRAGMA busy_timeout=5000")
+        con.execute("PRAGMA synchronous=NORMAL")
+        con.execute("PRAGMA cache_size=-65536")
+        con.execute("PRAGMA temp_store=MEMORY")
+        _tls.con = con
+        with _CONNS_LOCK:
+            _ALL_CONNS.append(con)
+    return con
+
+@contextmanager
+def db_writer():
+    """Thread's connection with in-process writers serialized; commits on success."""
+    with _WRITE_LOCK:
+        with db_conn() as db:
+            yield db
+
+@atexit.register
+def _close_db_conns():
+    with _CONNS_LOCK:
+        for con in _ALL_CONNS:
+            try:
+                con.close()
+            except Exception:
+                pass
+        _ALL_CONNS.clear()
+
+# Schema introspection is memoised: tables/columns only change on migrations.
+# invalidate_schema_cache() drops it (our own ALTERs, or a schema_version bump
+# from another process noticed by hb_source()).
+@lru_cache(maxsize=None)
+def _table_exists(name: str) -> bool:
+    cur = db_conn().execute("SELECT name FROM sqlite_master WHERE type='table' AND name=?;", (name,))
+    return cur.fetchone() is not None
 
 def table_exists(name: str) -> bool:
     try:
-        with db_conn() as db:
-            cur = db.cursor()
-            cur.execute("SELECT name FROM sqlite_master WHERE type='table' AND name=?;", (name,))
-            return cur.fetchone() is not None
+        return _table_exists(name)
     except Exception:
-        return False
+        return False  # not cached: lru_cache doesn't store raised calls
 
+@lru_cache(maxsize=None)
 def get_columns(table: str):
-    with db_conn() as db:
-        cur = db.cursor()
-        return cur.execute(f"PRAGMA table_info({table});").fetchall()
+    return tuple(db_conn().execute(f"PRAGMA table_info({table});").fetchall())
+
+def invalidate_schema_cache() -> None:
+    _table_exists.cache_clear()
+    get_columns.cache_clear()
+    _hb_candidate.cache_clear()
+    _node_id_candidate.cache_clear()
 
 def ensure_column(table: str, column: str, coltype: str) -> None:
     try:
         cols = [r[1] for r in get_columns(table)]
         if column not in cols:
-            with db_conn() as db:
+            with db_writer() as db:
                 cur = db.cursor()
                 cur.execute(f'ALTER TABLE {table} ADD COLUMN {column} {coltype};')
                 db.commit()
+            invalidate_schema_cache()
     except Exception:
         pass
 
 def init_db():
-    with db_conn() as db:
+    with db_writer() as db:
         cur = db.cursor()
         cur.execute("""
         CREATE TABLE IF NOT EXISTS camera_settings (
@@ -159,6 +289,13 @@ def init_db():
             af_roi_norm TEXT
         );""")
         cur.execute("""
+        CREATE TABLE IF NOT EXISTS clips_index (
+            rel TEXT PRIMARY KEY,
+            mtime REAL NOT NULL,
+            size INTEGER NOT NULL
+        );""")
+        cur.execute("CREATE INDEX IF NOT EXISTS idx_clips_index_mtime ON clips_index(mtime DESC);")
+        cur.execute("""
         CREATE TABLE IF NOT EXISTS camera_endpoints (
             camera_id TEXT PRIMARY KEY,
             ssh_host TEXT,
@@ -172,33 +309,42 @@ def init_db():
     ensure_column("camera_settings", "profile", "TEXT")
     ensure_column("camera_settings", "sensor_threshold_mm", "INTEGER")
     ensure_column("camera_settings", "af_roi_norm", "TEXT")
+    ensure_heartbeats_index()
 
 # -------------------- Misc helpers --------------------
 
+_NUM_RE = re.compile(r"[+-]?(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?")
+
 def parse_any_ts(value: Any) -> Optional[float]:
     if value is None:
         return None
-    try:
+    if isinstance(value, (int, float)):
         return float(value)
-    except Exception:
-        pass
-    s = str(value).strip()
+    return _parse_ts_str(str(value).strip())
+
+@lru_cache(maxsize=1024)  # heartbeat columns repeat the same strings until a node checks in
+def _parse_ts_str(s: str) -> Optional[float]:
+    utc = timezone.utc
+    if _NUM_RE.fullmatch(s):
+        return float(s)
     if s.endswith("Z"):
         try:
-            dt = datetime.fromisoformat(s[:-1])
-            dt = dt.replace(tzinfo=timezone.utc)
-            return dt.timestamp()
-        except Exception:
+            return datetime.fromisoformat(s[:-1]).replace(tzinfo=utc).timestamp()
+        except ValueError:
             pass
     try:
         dt = datetime.fromisoformat(s)
-        if dt.tzinfo is None:
-            dt = dt.replace(tzinfo=timezone.utc)
-        return dt.astimezone(timezone.utc).timestamp()
-    except Exception:
+    except ValueError:
         return None
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=utc)
+    return dt.astimezone(utc).timestamp()
 
 def hb_candidate_columns(cols: List[str]) -> Optional[str]:
+    return _hb_candidate(tuple(cols))
+
+@lru_cache(maxsize=64)
+def _hb_candidate(cols: Tuple[str, ...]) -> Optional[str]:
     candidates = [
         "last_heartbeat", "last_seen", "updated_at",
         "heartbeat_ts", "hb_ts", "last_seen_ts", "ts", "timestamp"
@@ -214,6 +360,10 @@ def hb_candidate_columns(cols: List[str]) -> Optional[str]:
     return None
 
 def node_id_candidate_columns(cols: List[str]) -> Optional[str]:
+    return _node_id_candidate(tuple(cols))
+
+@lru_cache(maxsize=64)
+def _node_id_candidate(cols: Tuple[str, ...]) -> Optional[str]:
     for name in ["node_id","id","node","name"]:
         for c in cols:
             if c.lower() == name:
@@ -234,67 +384,242 @@ def build_node_row(node_id: str, hb_ts: Optional[float], now_ts: float) -> Dict[
     return {"node_id": node_id, "last_heartbeat": hb_ts,
             "seconds_ago": int(delta), "status": status, "skew_ahead": 0}
 
+# (schema_version, source): which table/columns get_nodes reads. Discovered once
+# and re-detected only when some service changes the schema.
+_HB_SOURCE: Dict[str, Any] = {"schema": None, "src": None}
+
+def _discover_hb_source() -> Optional[Tuple[str, Optional[str], Optional[str]]]:
+    """(table, nid_col, ts_col) for get_nodes; ts_col may be None (nodes only)."""
+    if table_exists("nodes"):
+        colnames = [r[1] for r in get_columns("nodes")]
+        nid_col = node_id_candidate_columns(colnames)
+        ts_col  = hb_candidate_columns(colnames)
+        if nid_col and ts_col:
+            return ("nodes", nid_col, ts_col)
+        if nid_col:
+            return ("nodes", nid_col, None)
+    if table_exists("heartbeats"):
+        colnames = [r[1] for r in get_columns("heartbeats")]
+        nid_col = node_id_candidate_columns(colnames)
+        ts_col  = hb_candidate_columns(colnames)
+        if nid_col and ts_col:
+            return ("heartbeats", nid_col, ts_col)
+    return None
+
+def hb_source() -> Optional[Tuple[str, Optional[str], Optional[str]]]:
+    schema = db_conn().execute("PRAGMA schema_version").fetchone()[0]
+    if _HB_SOURCE["schema"] != schema:
+        invalidate_schema_cache()
+        _HB_SOURCE["src"] = _discover_hb_source()
+        _HB_SOURCE["schema"] = schema
+    return _HB_SOURCE["src"]
+
+def ensure_heartbeats_index() -> None:
+    """(nid, ts DESC) index so MAX(ts) GROUP BY nid is an index-only scan."""
+    try:
+        if not table_exists("heartbeats"):
+            return
+        colnames = [r[1] for r in get_columns("heartbeats")]
+        nid_col = node_id_candidate_columns(colnames)
+        ts_col  = hb_candidate_columns(colnames)
+        if nid_col and ts_col:
+            with db_writer() as db:
+                db.execute(f'CREATE INDEX IF NOT EXISTS idx_hb_{ts_col} ON heartbeats("{nid_col}", "{ts_col}" DESC);')
+                # sampled stats so the planner prefers the index; bounded cost on big tables
+                db.execute("PRAGMA analysis_limit=1000;")
+                db.execute("ANALYZE heartbeats;")
+                db.commit()
+    except Exception as e:
+        print("ensure_heartbeats_index error:", e)
+
 def get_nodes() -> List[Dict[str, Any]]:
     now = datetime.now(timezone.utc).timestamp()
     rows: List[Dict[str, Any]] = []
     try:
-        with db_conn() as db:
-            cur = db.cursor()
-            if table_exists("nodes"):
-                info = get_columns("nodes"); colnames = [r[1] for r in info]
-                nid_col = node_id_candidate_columns(colnames)
-                ts_col  = hb_candidate_columns(colnames)
-                if nid_col and ts_col:
-                    cur.execute(f'SELECT "{nid_col}", "{ts_col}" FROM nodes;')
-                    for nid, hb in cur.fetchall():
-                        ts = parse_any_ts(hb)
-                        rows.append(build_node_row(str(nid), ts, now))
-                    return sorted(rows, key=lambda r: (r["seconds_ago"] if r["seconds_ago"] is not None else 9e9))
-                if nid_col:
-                    cur.execute(f'SELECT "{nid_col}" FROM nodes;')
-                    for (nid,) in cur.fetchall():
-                        rows.append(build_node_row(str(nid), None, now))
-                    return rows
-            if table_exists("heartbeats"):
-                info = get_columns("heartbeats"); colnames = [r[1] for r in info]
-                nid_col = node_id_candidate_columns(colnames)
-                ts_col  = hb_candidate_columns(colnames)
-                if nid_col and ts_col:
-                    cur.execute(f'SELECT "{nid_col}", MAX("{ts_col}") FROM heartbeats GROUP BY "{nid_col}";')
-                    for nid, hb in cur.fetchall():
-                        ts = parse_any_ts(hb)
-                        rows.append(build_node_row(str(nid), ts, now))
-                    return sorted(rows, key=lambda r: (r["seconds_ago"] if r["seconds_ago"] is not None else 9e9))
+        src = hb_source()
+        if not src:
             return []
+        table, nid_col, ts_col = src
+        cur = db_conn().cursor()
+        if table == "nodes" and ts_col:
+            cur.execute(f'SELECT "{nid_col}", "{ts_col}" FROM nodes;')
+        elif table == "nodes":
+            cur.execute(f'SELECT "{nid_col}" FROM nodes;')
+            for (nid,) in cur.fetchall():
+                rows.append(build_node_row(str(nid), None, now))
+            return rows
+        else:
+            cur.execute(f'SELECT "{nid_col}", MAX("{ts_col}") FROM heartbeats GROUP BY "{nid_col}";')
+        for nid, hb in cur.fetchall():
+            ts = parse_any_ts(hb)
+            rows.append(build_node_row(str(nid), ts, now))
+        return sorted(rows, key=lambda r: (r["seconds_ago"] if r["seconds_ago"] is not None else 9e9))
     except Exception as e:
         print("get_nodes error:", e)
         return []
 
+def _disk_target(path: Path) -> Path:
+    """Nearest existing directory for statvfs (clips dir may not exist yet)."""
+    target = path
+    while not target.exists() and target != target.parent:
+        target = target.parent
+    if not target.exists():
+        target = Path(base_dir) if Path(base_dir).exists() else Path("/")
+    if target.is_file():
+        target = target.parent
+    return target
+
+_DISK_TARGET = _disk_target(CLIPS_DIR)
+DISK_FREE_TTL_SEC = 5.0
+_DISK_CACHE: Dict[str, Tuple[float, Dict[str, Any]]] = {}  # str(path) -> (monotonic ts, result)
+
 def disk_free(path: Path) -> Dict[str, Any]:
+    key = str(path)
+    hit = _DISK_CACHE.get(key)
+    if hit and time.monotonic() - hit[0] < DISK_FREE_TTL_SEC:
+        return dict(hit[1])
     try:
-        target = path
-        while not target.exists() and target != target.parent:
-            target = target.parent
-        if not target.exists():
-            target = Path(base_dir) if Path(base_dir).exists() else Path("/")
-        if target.is_file():
-            target = target.parent
+        target = _DISK_TARGET if path == CLIPS_DIR else _disk_target(path)
         usage = shutil.disk_usage(str(target))
         total = float(usage.total); used = float(usage.used); avail = float(usage.free)
         pct_free = (avail / total) * 100.0 if total else 0.0
-        return {"total": total, "used": used, "avail": avail, "pct_free": pct_free}
+        val = {"total": total, "used": used, "avail": avail, "pct_free": pct_free}
+        _DISK_CACHE[key] = (time.monotonic(), val)
+        return dict(val)
     except Exception as e:
         print(f"disk_free error at {path}: {e}")
         return {"total": 0.0, "used": 0.0, "avail": 0.0, "pct_free": 0.0}
 
+def _walk_mp4s(root: Path):
+    """Yield (rel, mtime, size) for every .mp4 under root; one stat per file via DirEntry."""
+    root_s = str(root)
+    prefix = len(root_s) + 1
+    stack = [root_s]
+    while stack:
+        d = stack.pop()
+        try:
+            with os.scandir(d) as it:
+                for e in it:
+                    try:
+                        if e.is_dir(follow_symlinks=False):
+                            stack.append(e.path)
+                        elif e.name.endswith(".mp4"):
+                            st = e.stat()
+                            yield e.path[prefix:], st.st_mtime, st.st_size
+                    except OSError:
+                        continue  # vanished mid-walk (deleted/pruned)
+        except OSError:
+            continue
+
+# -------------------- Clips index --------------------
+# clips_index mirrors CLIPS_DIR (rel, mtime, size) so the clip listings are an
+# indexed SELECT instead of a tree walk per request. One gunicorn worker (whoever
+# holds the flock) keeps it in sync from watchdog events, plus a full reconcile
+# every CLIPS_INDEX_SYNC_SEC for anything missed. Without watchdog the index is
+# not used at all and listings walk the tree per request, as before.
+CLIPS_INDEX_SYNC_SEC = 300
+CLIPS_INDEX_LOCK = str(DB_PATH) + ".clips_index.lock"
+
+def sync_clips_index() -> None:
+    on_disk = {rel: (mt, size) for rel, mt, size in _walk_mp4s(CLIPS_DIR)} if CLIPS_DIR.exists() else {}
+    indexed = {rel: (mt, size) for rel, mt, size in db_conn().execute("SELECT rel, mtime, size FROM clips_index;")}
+    stale = [(rel,) for rel in indexed.keys() - on_disk.keys()]
+    fresh = [(rel, mt, size) for rel, (mt, size) in on_disk.items() if indexed.get(rel) != (mt, size)]
+    if stale or fresh:
+        with db_writer() as db:
+            db.executemany("DELETE FROM clips_index WHERE rel=?;", stale)
+            db.executemany("INSERT OR REPLACE INTO clips_index(rel, mtime, size) VALUES (?,?,?);", fresh)
+
+def _index_rel(path: str) -> Optional[str]:
+    root = str(CLIPS_DIR) + os.sep
+    return path[len(root):] if path.startswith(root) else None
+
+def index_clip_file(path: str) -> None:
+    rel = _index_rel(path)
+    if not rel or not rel.endswith(".mp4"):
+        return
+    try:
+        st = os.stat(path)
+    except OSError:
+        return unindex_clip_path(path)
+    with db_writer() as db:
+        db.execute("INSERT OR REPLACE INTO clips_index(rel, mtime, size) VALUES (?,?,?);",
+                   (rel, st.st_mtime, st.st_size))
+
+def unindex_clip_path(path: str) -> None:
+    """Drop a clip, or every clip under a removed directory."""
+    rel = _index_rel(path)
+    if not rel:
+        return
+    esc = rel.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    with db_writer() as db:
+        db.execute("DELETE FROM clips_index WHERE rel=? OR rel LIKE ? ESCAPE '\\';", (rel, esc + "/%"))
+
+class _ClipsIndexHandler(FileSystemEventHandler):
+    def on_closed(self, event):  # IN_CLOSE_WRITE: upload finished
+        if not event.is_directory:
+            index_clip_file(event.src_path)
+
+    def on_created(self, event):
+        if not event.is_directory:
+            index_clip_file(event.src_path)
+
+    def on_moved(self, event):
+        unindex_clip_path(event.src_path)
+        if not event.is_directory:
+            index_clip_file(event.dest_path)
+
+    def on_deleted(self, event):
+        unindex_clip_path(event.src_path)
+
+def _clips_index_worker() -> None:
+    if not Observer:
+        return
+    lock_f = open(CLIPS_INDEX_LOCK, "a")
+    while True:
+        try:
+            fcntl.flock(lock_f, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            break
+        except OSError:
+            time.sleep(CLIPS_INDEX_SYNC_SEC)  # another worker is the indexer
+    try:
+        CLIPS_DIR.mkdir(parents=True, exist_ok=True)
+        obs = Observer()
+        obs.schedule(_ClipsIndexHandler(), str(CLIPS_DIR), recursive=True)
+        obs.daemon = True
+        obs.start()
+    except Exception as e:
+        print("clips_index watcher error:", e)
+        # no events = the index would go stale; empty it so listings walk the tree
+        with db_writer() as db:
+            db.execute("DELETE FROM clips_index;")
+        return
+    while True:
+        try:
+            sync_clips_index()
+        except Exception as e:
+            print("clips_index sync error:", e)
+        time.sleep(CLIPS_INDEX_SYNC_SEC)
+
+def _clips_index_ready() -> bool:
+    # no watchdog = nothing keeps the index current; empty table = first sync
+    # still running (fresh install). Walk the tree in both cases.
+    if not Observer:
+        return False
+    return db_conn().execute("SELECT 1 FROM clips_index LIMIT 1;").fetchone() is not None
+
 def list_recent_clips(limit: int = 200) -> List[Dict[str, Any]]:
     items: List[Dict[str, Any]] = []
     try:
-        if not CLIPS_DIR.exists():
-            return items
-        for p in sorted(CLIPS_DIR.glob("**/*.mp4"), key=lambda x: x.stat().st_mtime, reverse=True)[:limit]:
-            st = p.stat()
-            items.append({"rel": str(p.relative_to(CLIPS_DIR)), "size": st.st_size, "mtime": st.st_mtime})
+        if _clips_index_ready():
+            found = db_conn().execute(
+                "SELECT rel, mtime, size FROM clips_index ORDER BY mtime DESC LIMIT ?;", (limit,)).fetchall()
+        elif CLIPS_DIR.exists():
+            found = heapq.nlargest(limit, _walk_mp4s(CLIPS_DIR), key=lambda t: t[1])
+        else:
+            found = []
+        for rel, mt, size in found:
+            items.append({"rel": rel, "size": size, "mtime": mt})
     except Exception as e:
         print("list_recent_clips error:", e)
     return items
@@ -310,20 +635,37 @@ def list_clips_filtered(
 ) -> List[Dict[str, Any]]:
     items: List[Dict[str, Any]] = []
     try:
-        if not CLIPS_DIR.exists():
-            return items
-        paths = list(CLIPS_DIR.glob("**/*.mp4"))
-        reverse = (sort != "oldest")
-        paths.sort(key=lambda p: p.stat().st_mtime, reverse=reverse)
-        for p in paths:
-            st = p.stat()
-            mt = st.st_mtime
+        if _clips_index_ready():
+            where, args = [], []
             if not all_time:
-                if (start_ts is not None and mt < start_ts) or (end_ts is not None and mt > end_ts):
-                    continue
-            items.append({"rel": str(p.relative_to(CLIPS_DIR)), "size": st.st_size, "mtime": mt})
-            if limit is not None and len(items) >= limit:
-                break
+                if start_ts is not None:
+                    where.append("mtime >= ?"); args.append(start_ts)
+                if end_ts is not None:
+                    where.append("mtime <= ?"); args.append(end_ts)
+            sql = "SELECT rel, mtime, size FROM clips_index"
+            if where:
+                sql += " WHERE " + " AND ".join(where)
+            sql += " ORDER BY mtime " + ("ASC" if sort == "oldest" else "DESC")
+            if limit is not None:
+                sql += " LIMIT ?"; args.append(limit)
+            picked = db_conn().execute(sql + ";", args).fetchall()
+        elif CLIPS_DIR.exists():
+            found = _walk_mp4s(CLIPS_DIR)
+            if not all_time:
+                # filter during the walk so out-of-range files are never sorted
+                found = (t for t in found
+                         if not ((start_ts is not None and t[1] < start_ts) or (end_ts is not None and t[1] > end_ts)))
+            key = lambda t: t[1]
+            if limit is None:
+                picked = sorted(found, key=key, reverse=(sort != "oldest"))
+            elif sort != "oldest":
+                picked = heapq.nlargest(limit, found, key=key)
+            else:
+                picked = heapq.nsmallest(limit, found, key=key)
+        else:
+            picked = []
+        for rel, mt, size in picked:
+            items.append({"rel": rel, "size": size, "mtime": mt})
     except Exception as e:
         print("list_clips_filtered error:", e)
     return items
@@ -383,43 +725,55 @@ def validate_cfg(cfg: dict) -> List[Dict[str,str]]:
     return issues
 
 def read_config_text(raw: bool) -> str:
-    with open(HUB_CFG_PATH, "r") as f:
-        cfg = yaml.safe_load(f) or {}
-    if raw:
-        return yaml.safe_dump(cfg, sort_keys=False)
-    red = redact_config(cfg)
-    return yaml.safe_dump(red, sort_keys=False)
+    cfg = load_hub_cfg()
+    slot = "raw_text" if raw else "redacted_text"
+    if _CFG_CACHE[slot] is None:
+        _CFG_CACHE[slot] = yaml.dump(cfg if raw else redact_config(cfg), Dumper=YamlDumper, sort_keys=False)
+    return _CFG_CACHE[slot]
+
+def config_issues() -> List[Dict[str,str]]:
+    """validate_cfg() of the current config; re-run each call since its path checks track the filesystem."""
+    return validate_cfg(load_hub_cfg())
 
 # -------------------- SSH / HTTP helpers --------------------
 
-def _ssh(cmd: List[str], timeout: int = 25) -> subprocess.CompletedProcess:
-    return subprocess.run(cmd, capture_output=True, text=True, timeout=timeout)
+# Multiplex every ssh/scp to a node over one master connection: only the first
+# call per host pays for TCP + key exchange + auth; the rest open a channel.
+_SSH_MUX_OPTS = [
+    "-o", "ControlMaster=auto",
+    "-o", "ControlPath=~/.ssh/cm-%r@%h:%p",
+    "-o", "ControlPersist=60s",
+    # never sit on a password/host-key prompt, and give up fast on a dead host
+    "-o", "BatchMode=yes",
+    "-o", "ConnectTimeout=5",
+]
+
+def _ssh(cmd: List[str], timeout: float = 25, input: Optional[str] = None) -> subprocess.CompletedProcess:
+    if cmd and cmd[0] in ("ssh", "scp"):
+        cmd = [cmd[0], *_SSH_MUX_OPTS, *cmd[1:]]
+    return subprocess.run(cmd, capture_output=True, text=True, timeout=timeout, input=input)
+
+SSH_READ_TIMEOUT_SEC = 5
 
 def _ssh_cat(ssh_user: str, ssh_host: str, path: str) -> Tuple[bool, str]:
-    p = _ssh(["ssh", f"{ssh_user}@{ssh_host}", "cat", path])
+    try:
+        p = _ssh(["ssh", f"{ssh_user}@{ssh_host}", "cat", path], timeout=SSH_READ_TIMEOUT_SEC)
+    except subprocess.TimeoutExpired:
+        return False, f"ssh read timed out after {SSH_READ_TIMEOUT_SEC}s"
     return (p.returncode == 0, p.stdout if p.returncode == 0 else p.stderr)
 
+_WRITE_RESTART_SH = 'cat > "$1" && mv "$1" "$2" && sudo systemctl restart "$3"'
+
 def _ssh_write_and_restart(ssh_user: str, ssh_host: str, path: str, content: str, service: str) -> Tuple[bool, str]:
+    # Content goes over the ssh channel's stdin; write-temp, rename and restart
+    # happen in one remote shell (one ssh call, no local temp file, no scp).
     tmp_remote = f"{path}.tmp.{int(datetime.now().timestamp())}"
-    with tempfile.NamedTemporaryFile("w", delete=False) as tf:
-        tf.write(content); tf.flush()
-        local_tmp = tf.name
-    try:
-        p1 = _ssh(["scp", local_tmp, f"{ssh_user}@{ssh_host}:{tmp_remote}"])
-        if p1.returncode != 0:
-            return False, p1.stderr
-        mv_cmd = f"mv {tmp_remote} {path}"
-        sysd_cmd = f"sudo systemctl restart {service}"
-        p2 = _ssh(["ssh", f"{ssh_user}@{ssh_host}", mv_cmd])
-        if p2.returncode != 0:
-            return False, p2.stderr
-        p3 = _ssh(["ssh", f"{ssh_user}@{ssh_host}", sysd_cmd])
-        if p3.returncode != 0:
-            return False, p3.stderr
-        return True, "ok"
-    finally:
-        try: os.unlink(local_tmp)
-        except Exception: pass
+    remote = f"sh -c {shlex.quote(_WRITE_RESTART_SH)} _ " + " ".join(
+        shlex.quote(a) for a in (tmp_remote, path, service))
+    p = _ssh(["ssh", f"{ssh_user}@{ssh_host}", remote], input=content)
+    if p.returncode != 0:
+        return False, p.stderr
+    return True, "ok"
 
 def _http_json(url: str, method: str = "GET", body: Optional[dict] = None, timeout: int = 8) -> Tuple[bool, Any, str]:
     data = None
@@ -443,38 +797,49 @@ def _http_json(url: str, method: str = "GET", body: Optional[dict] = None, timeo
     except Exception as e:
         return False, None, str(e)
 
+# Remote poll loops for wait_unit_state; "$1" is the unit name.
+_UNIT_WAIT_SH = {
+    "active": 'until [ "$(systemctl is-active "$1")" = active ]; do sleep 0.2; done',
+    "inactive": 'while :; do case "$(systemctl is-active "$1")" in inactive|failed|unknown) exit 0;; esac; sleep 0.2; done',
+}
+
 def wait_unit_state(ssh_user: str, ssh_host: str, unit: str, desired: str, timeout_sec: float = 12.0) -> bool:
-    deadline = time.time() + timeout_sec
-    while time.time() < deadline:
-        p = _ssh(["ssh", f"{ssh_user}@{ssh_host}", f"systemctl is-active {unit}"])
-        st = (p.stdout or p.stderr).strip()
-        if desired == "active" and st == "active":
-            return True
-        if desired == "inactive" and st in ("inactive","failed","unknown"):
-            return True
-        time.sleep(0.35)
-    return False
+    # One ssh call that polls on the node (bounded by coreutils timeout) instead of
+    # one ssh round-trip every 350ms from here.
+    script = _UNIT_WAIT_SH.get(desired)
+    if not script:
+        return False
+    remote = f"timeout {timeout_sec:g} sh -c {shlex.quote(script)} _ {shlex.quote(unit)}"
+    try:
+        p = _ssh(["ssh", f"{ssh_user}@{ssh_host}", remote], timeout=timeout_sec + 15)
+    except subprocess.TimeoutExpired:
+        return False
+    return p.returncode == 0
+
+_READY_RE = re.compile(r"\[READY\]\s+Camera node started")
 
 def wait_until_recorder_ready(ssh_user: str, ssh_host: str, unit: str, timeout_sec: float = 20.0) -> Tuple[bool, str]:
     if not wait_unit_state(ssh_user, ssh_host, unit, "active", timeout_sec):
         tail = _ssh(["ssh", f"{ssh_user}@{ssh_host}", f"journalctl -u {unit} -n 80 --no-pager --output=short"]).stdout
         return False, f"{unit} not active\n{(tail or '').strip()}"
     tail = _ssh(["ssh", f"{ssh_user}@{ssh_host}", f"journalctl -u {unit} -n 120 --no-pager --output=short"]).stdout
-    if re.search(r"\[READY\]\s+Camera node started", tail or ""):
+    if _READY_RE.search(tail or ""):
         return True, ""
     return True, (tail or "")
 
 # -------------------- Template filters --------------------
 
+_UNITS = ("B","KB","MB","GB","TB","PB")
+
 @app.template_filter("human_bytes")
 def human_bytes(n: float) -> str:
-    try: n = float(n)
-    except Exception: return "0 B"
-    units = ["B","KB","MB","GB","TB","PB"]
-    i = 0
-    while n >= 1024 and i < len(units)-1:
-        n /= 1024.0; i += 1
-    return f"{int(n)} {units[i]}" if i == 0 else f"{n:.1f} {units[i]}"
+    if not isinstance(n, (int, float)):
+        try: n = float(n)
+        except (TypeError, ValueError): return "0 B"
+    if n < 1024:
+        return f"{int(n)} B"
+    i = min((int(n).bit_length() - 1) // 10, len(_UNITS) - 1)  # floor(log1024(n)) without a loop
+    return f"{n / (1 << (10 * i)):.1f} {_UNITS[i]}"
 
 @app.template_filter("date_fmt")
 def date_fmt(ts: Optional[float]) -> str:
@@ -512,31 +877,60 @@ def nodes_page():
 @app.route("/nodes.csv")
 def nodes_csv():
     nodes = get_nodes()
-    lines = ["node_id,last_heartbeat_utc,seconds_ago,status,skew_ahead"]
-    for n in nodes:
-        ts = "" if n["last_heartbeat"] is None else datetime.fromtimestamp(n["last_heartbeat"], tz=timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
-        lines.append(f'{n["node_id"]},{ts},{n["seconds_ago"] if n["seconds_ago"] is not None else ""},{n["status"]},{n.get("skew_ahead",0)}')
-    csv = "\n".join(lines) + "\n"
-    resp = make_response(csv)
-    resp.headers["Content-Type"] = "text/csv"
-    resp.headers["Content-Disposition"] = 'attachment; filename="nodes.csv"'
-    return resp
+
+    def gen():
+        buf = io.StringIO()
+        w = csv.writer(buf, lineterminator="\n")
+        w.writerow(["node_id", "last_heartbeat_utc", "seconds_ago", "status", "skew_ahead"])
+        for n in nodes:
+            ts = "" if n["last_heartbeat"] is None else datetime.fromtimestamp(n["last_heartbeat"], tz=timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
+            w.writerow([n["node_id"], ts, n["seconds_ago"] if n["seconds_ago"] is not None else "",
+                        n["status"], n.get("skew_ahead", 0)])
+            yield buf.getvalue()
+            buf.seek(0); buf.truncate()
+        yield buf.getvalue()  # header only, when there are no nodes
+
+    return Response(stream_with_context(gen()), mimetype="text/csv",
+                    headers={"Content-Disposition": 'attachment; filename="nodes.csv"'})
 
 # -------------------- NEW: Unified status API --------------------
 
+# Encoded /api/nodes response shared by polls within NODES_BODY_TTL_SEC.
+NODES_BODY_TTL_SEC = 0.5
+_NODES_BODY: Dict[str, Any] = {"at": 0.0, "etag": None, "body": None}
+_NODES_BODY_LOCK = threading.Lock()
+
+def _nodes_body() -> Tuple[str, bytes]:
+    with _NODES_BODY_LOCK:
+        if _NODES_BODY["body"] is not None and time.monotonic() - _NODES_BODY["at"] < NODES_BODY_TTL_SEC:
+            return _NODES_BODY["etag"], _NODES_BODY["body"]
+        nodes = get_nodes()
+        for n in nodes:
+            ts = n.get("last_heartbeat")
+            n["last_heartbeat_iso"] = None if ts is None else datetime.fromtimestamp(ts, tz=timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+        # Weak validator: same heartbeats and statuses; now_ts/seconds_ago may differ.
+        sig = "|".join(f'{n["node_id"]}:{n["last_heartbeat"]}:{n["status"]}:{n["skew_ahead"]}' for n in nodes)
+        etag = 'W/"%s"' % hashlib.md5(sig.encode("utf-8")).hexdigest()
+        body = ojsonify({
+            "ok": True,
+            "now_ts": datetime.now(timezone.utc).timestamp(),
+            "hb_online_sec": HB_ONLINE,
+            "hb_stale_sec": HB_STALE,
+            "nodes": nodes
+        }).get_data()
+        _NODES_BODY.update(at=time.monotonic(), etag=etag, body=body)
+        return etag, body
+
 @app.route("/api/nodes")
 def api_nodes():
-    nodes = get_nodes()
-    for n in nodes:
-        ts = n.get("last_heartbeat")
-        n["last_heartbeat_iso"] = None if ts is None else datetime.fromtimestamp(ts, tz=timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
-    return jsonify({
-        "ok": True,
-        "now_ts": datetime.now(timezone.utc).timestamp(),
-        "hb_online_sec": HB_ONLINE,
-        "hb_stale_sec": HB_STALE,
-        "nodes": nodes
-    }), 200
+    etag, body = _nodes_body()
+    if request.headers.get("If-None-Match") == etag:
+        resp = Response(status=304)
+    else:
+        resp = Response(body, status=200, mimetype="application/json")
+    resp.headers["ETag"] = etag
+    resp.headers["Cache-Control"] = "no-cache"
+    return resp
 
 # -------------------- Clips --------------------
 
@@ -574,7 +968,7 @@ def clips_page():
 
 @app.route("/download/<path:relpath>")
 def download_clip(relpath: str):
-    base = CLIPS_DIR.resolve()
+    base = _CLIPS_BASE
     file_path = (CLIPS_DIR / relpath).resolve()
     try: file_path.relative_to(base)
     except Exception: abort(404)
@@ -585,9 +979,16 @@ def download_clip(relpath: str):
                "X-Accel-Redirect": internal_uri}
     return Response("", headers=headers)
 
+_NO_THUMB_SVG = b'''<svg xmlns="http://www.w3.org/2000/svg" width="300" height="170">
+      <rect width="100%" height="100%" fill="#e5e7eb"/>
+      <text x="50%" y="50%" text-anchor="middle" dominant-baseline="middle" fill="#6b7280" font-size="14">No thumbnail</text>
+    </svg>'''
+# Short max-age: the real thumbnail usually appears on the next thumbs run
+_NO_THUMB_HEADERS = {"Cache-Control": "public, max-age=300", "Content-Length": str(len(_NO_THUMB_SVG))}
+
 @app.route("/thumb/<path:relpath>")
 def thumb(relpath: str):
-    base = CLIPS_DIR.resolve()
+    base = _CLIPS_BASE
     mp4 = (CLIPS_DIR / relpath).with_suffix(".mp4").resolve()
     jpg = mp4.with_suffix(".jpg")
     try:
@@ -597,22 +998,22 @@ def thumb(relpath: str):
     if jpg.exists():
         internal_uri = "/__protected__/thumbs/" + str(jpg.relative_to(base)).replace("\\", "/")
         return Response("", headers={"X-Accel-Redirect": internal_uri})
-    svg = '''<svg xmlns="http://www.w3.org/2000/svg" width="300" height="170">
-      <rect width="100%" height="100%" fill="#e5e7eb"/>
-      <text x="50%" y="50%" text-anchor="middle" dominant-baseline="middle" fill="#6b7280" font-size="14">No thumbnail</text>
-    </svg>'''
-    return Response(svg, headers={"Content-Type": "image/svg+xml"})
+    return Response(_NO_THUMB_SVG, mimetype="image/svg+xml", headers=_NO_THUMB_HEADERS)
 
 # -------------------- Actions (thumbs/delete) --------------------
 
 def prune_db_rows_for_clip(mp4_path: Path) -> int:
+    try:
+        unindex_clip_path(str(mp4_path))
+    except Exception as e:
+        print("clips_index prune error:", e)
     try:
         if not table_exists("clips"):
             return 0
         rel = str(mp4_path.relative_to(CLIPS_DIR).as_posix())
         abs_path = str(mp4_path)
         base = mp4_path.name
-        with db_conn() as db:
+        with db_writer() as db:
             cur = db.cursor()
             cols = [r[1] for r in get_columns("clips")]
             pref_order = ["relpath","relative_path","path","filepath","file_path","clip_path","clip","filename","name"]
@@ -626,106 +1027,103 @@ def prune_db_rows_for_clip(mp4_path: Path) -> int:
                         cand = c; break
             if cand is None:
                 return 0
-            deleted = 0
-            for q, arg in [
-                (f'DELETE FROM clips WHERE "{cand}" = ?;', rel),
-                (f'DELETE FROM clips WHERE "{cand}" = ?;', abs_path),
-                (f'DELETE FROM clips WHERE "{cand}" LIKE ?;', f'%/{base}'),
-                (f'DELETE FROM clips WHERE "{cand}" = ?;', base),
-            ]:
-                cur.execute(q, (arg,))
-                deleted += cur.rowcount if cur.rowcount is not None else 0
+            # One statement for every form the path may have been stored in
+            cur.execute(f'DELETE FROM clips WHERE "{cand}" IN (?, ?, ?) OR "{cand}" LIKE ?;',
+                        (rel, abs_path, base, f'%/{base}'))
+            deleted = cur.rowcount if cur.rowcount is not None else 0
             db.commit()
             return deleted
     except Exception as e:
         print("prune_db_rows_for_clip error:", e)
         return 0
 
+_THUMBS_SUMMARY_RE = re.compile(r"built=(\d+)\s+removed=(\d+)")  # thumbs.py's last line
+
 @app.route("/action/thumbs/run", methods=["POST"])
 def run_thumbs():
     py = str((APP_DIR / "venv" / "bin" / "python"))
     script = str(APP_DIR / "thumbs.py")
     if not Path(py).exists(): py = "python3"
     if not Path(script).exists():
-        return jsonify({"ok": False, "error": "thumbs.py not found"}), 500
+        return ojsonify({"ok": False, "error": "thumbs.py not found"}), 500
     try:
         proc = subprocess.run([py, script, "--prune"], cwd=str(APP_DIR),
                               capture_output=True, text=True, timeout=300)
     except subprocess.TimeoutExpired:
-        return jsonify({"ok": False, "error": "thumbnail job timed out"}), 500
+        return ojsonify({"ok": False, "error": "thumbnail job timed out"}), 500
     except Exception as e:
-        return jsonify({"ok": False, "error": str(e)}), 500
+        return ojsonify({"ok": False, "error": str(e)}), 500
     out = (proc.stdout or "") + (proc.stderr or "")
-    m = re.search(r"built=(\d+)\s+removed=(\d+)", out)
+    m = _THUMBS_SUMMARY_RE.search(out)
     built = int(m.group(1)) if m else 0
     removed = int(m.group(2)) if m else 0
     ok = proc.returncode == 0
-    return jsonify({"ok": ok, "built": built, "removed": removed, "raw": out[-4000:]}), (200 if ok else 500)
+    return ojsonify({"ok": ok, "built": built, "removed": removed, "raw": out[-4000:]}), (200 if ok else 500)
+
+def _is_empty_dir(p: Path) -> bool:
+    # Path.iterdir() lists the whole directory first; scandir stops at the first entry.
+    with os.scandir(p) as it:
+        return next(it, None) is None
 
 @app.route("/action/clip/delete", methods=["POST"])
 def delete_clip():
     data = request.get_json(silent=True) or {}
     rel = data.get("relpath", "")
     if not rel or "/" not in rel:
-        return jsonify({"ok": False, "error": "invalid relpath"}), 400
+        return ojsonify({"ok": False, "error": "invalid relpath"}), 400
     if not rel.lower().endswith(".mp4"):
-        return jsonify({"ok": False, "error": "only .mp4 deletions allowed"}), 400
-    base = CLIPS_DIR.resolve()
+        return ojsonify({"ok": False, "error": "only .mp4 deletions allowed"}), 400
+    base = _CLIPS_BASE
     mp4 = (CLIPS_DIR / rel).resolve()
     try: mp4.relative_to(base)
-    except Exception: return jsonify({"ok": False, "error": "path outside clip dir"}), 400
+    except Exception: return ojsonify({"ok": False, "error": "path outside clip dir"}), 400
     if not mp4.exists() or not mp4.is_file():
         pruned = prune_db_rows_for_clip(mp4)
-        return jsonify({"ok": True, "deleted": {"mp4": False, "jpg": False}, "db_pruned": pruned}), 200
+        return ojsonify({"ok": True, "deleted": {"mp4": False, "jpg": False}, "db_pruned": pruned}), 200
     jpg = mp4.with_suffix(".jpg")
     deleted = {"mp4": False, "jpg": False}
     try:
         mp4.unlink(); deleted["mp4"] = True
     except Exception as e:
-        return jsonify({"ok": False, "error": f"failed to delete video: {e}"}), 500
+        return ojsonify({"ok": False, "error": f"failed to delete video: {e}"}), 500
     try:
         if jpg.exists(): jpg.unlink(); deleted["jpg"] = True
     except Exception as e:
         pruned = prune_db_rows_for_clip(mp4)
-        return jsonify({"ok": False, "error": f"video deleted, but failed to delete thumbnail: {e}",
+        return ojsonify({"ok": False, "error": f"video deleted, but failed to delete thumbnail: {e}",
                         "deleted": deleted, "db_pruned": pruned}), 500
     try:
         p = mp4.parent
         while p != base:
-            if not any(p.iterdir()):
+            if _is_empty_dir(p):
                 p.rmdir(); p = p.parent
             else:
                 break
     except Exception: pass
     pruned = prune_db_rows_for_clip(mp4)
-    return jsonify({"ok": True, "deleted": deleted, "db_pruned": pruned}), 200
+    return ojsonify({"ok": True, "deleted": deleted, "db_pruned": pruned}), 200
 
 # -------------------- CONFIG CENTER --------------------
 
 @app.route("/config/")
 def config_home():
     try:
-        with open(HUB_CFG_PATH, "r") as f:
-            cfg = yaml.safe_load(f) or {}
+        text_red = read_config_text(raw=False)
+        issues = config_issues()
     except Exception:
-        cfg = {}
-    red = redact_config(cfg)
-    text_red = yaml.safe_dump(red, sort_keys=False)
-    issues = validate_cfg(cfg)
+        text_red = yaml.dump({}, Dumper=YamlDumper, sort_keys=False)
+        issues = validate_cfg({})
     return render_template("config.html", cfg_text=text_red,
                            cfg_path=str(HUB_CFG_PATH), issues=issues, title="Config")
 
 @app.route("/config/reload", methods=["POST"])
 def config_reload():
     try:
-        with open(HUB_CFG_PATH, "r") as f:
-            cfg = yaml.safe_load(f) or {}
-        red = redact_config(cfg)
-        text_red = yaml.safe_dump(red, sort_keys=False)
-        issues = validate_cfg(cfg)
-        return jsonify({"ok": True, "text": text_red, "issues": issues}), 200
+        text_red = read_config_text(raw=False)
+        issues = config_issues()
+        return ojsonify({"ok": True, "text": text_red, "issues": issues}), 200
     except Exception as e:
-        return jsonify({"ok": False, "error": str(e)}), 500
+        return ojsonify({"ok": False, "error": str(e)}), 500
 
 @app.route("/config/download")
 def config_download_raw():
@@ -765,82 +1163,150 @@ def list_camera_ids() -> List[str]:
             out.append(r['id'])
     return out
 
+# Hot camera_settings/camera_endpoints statements, kept as module constants so
+# each connection's statement cache (cached_statements) reuses the compiled form.
+_SQL_GET_SETTINGS = """
+    SELECT camera_id, resolution, fps, bitrate_kbps, rotation, clip_duration_s, updated_at,
+           profile, sensor_threshold_mm, af_roi_norm
+    FROM camera_settings WHERE camera_id = ?;
+"""
+
+_SQL_UPSERT_SETTINGS = """
+    INSERT INTO camera_settings (camera_id, resolution, fps, bitrate_kbps, rotation, clip_duration_s, updated_at, profile, sensor_threshold_mm, af_roi_norm)
+    VALUES (:cam, :res, :fps, :br, COALESCE(:rot, 0), COALESCE(:dur, 5), :now, :profile,
+            COALESCE(:thr, 1000), :roi)
+    ON CONFLICT(camera_id) DO UPDATE SET
+      resolution=excluded.resolution,
+      fps=excluded.fps,
+      bitrate_kbps=excluded.bitrate_kbps,
+      rotation=COALESCE(:rot, rotation),
+      clip_duration_s=COALESCE(:dur, clip_duration_s),
+      updated_at=excluded.updated_at,
+      profile=excluded.profile,
+      sensor_threshold_mm=COALESCE(:thr, sensor_threshold_mm),
+      af_roi_norm=COALESCE(excluded.af_roi_norm, af_roi_norm)
+    WHERE resolution IS NOT excluded.resolution
+       OR fps IS NOT excluded.fps
+       OR bitrate_kbps IS NOT excluded.bitrate_kbps
+       OR rotation IS NOT COALESCE(:rot, rotation)
+       OR clip_duration_s IS NOT COALESCE(:dur, clip_duration_s)
+       OR profile IS NOT excluded.profile
+       OR sensor_threshold_mm IS NOT COALESCE(:thr, sensor_threshold_mm)
+       OR af_roi_norm IS NOT COALESCE(excluded.af_roi_norm, af_roi_norm);
+"""
+
+_SQL_GET_ENDPOINT = """
+    SELECT camera_id, ssh_host, ssh_user, config_path, service_name, updated_at
+    FROM camera_endpoints WHERE camera_id = ?;
+"""
+
+_SQL_UPSERT_ENDPOINT = """
+    INSERT INTO camera_endpoints (camera_id, ssh_host, ssh_user, config_path, service_name, updated_at)
+    VALUES (?, ?, ?, ?, ?, ?)
+    ON CONFLICT(camera_id) DO UPDATE SET
+      ssh_host=excluded.ssh_host,
+      ssh_user=excluded.ssh_user,
+      config_path=excluded.config_path,
+      service_name=excluded.service_name,
+      updated_at=excluded.updated_at
+    WHERE ssh_host IS NOT excluded.ssh_host
+       OR ssh_user IS NOT excluded.ssh_user
+       OR config_path IS NOT excluded.config_path
+       OR service_name IS NOT excluded.service_name;
+"""
+
+_SQL_CAMERAS_FULL = """
+    WITH ids AS (
+      SELECT camera_id AS id FROM camera_settings
+      UNION
+      SELECT camera_id AS id FROM camera_endpoints
+      UNION
+      SELECT node_id   AS id FROM nodes WHERE lower(node_id) LIKE 'cam%'
+    )
+    SELECT ids.id,
+           e.camera_id, e.ssh_host, e.ssh_user, e.config_path, e.service_name, e.updated_at,
+           s.camera_id, s.resolution, s.fps, s.bitrate_kbps, s.rotation, s.clip_duration_s,
+           s.updated_at, s.profile, s.sensor_threshold_mm, s.af_roi_norm
+    FROM ids
+    LEFT JOIN camera_endpoints e ON e.camera_id = ids.id
+    LEFT JOIN camera_settings  s ON s.camera_id = ids.id
+    ORDER BY 1;
+"""
+
 def get_camera_settings(camera_id: str) -> Dict[str, Any]:
-    ensure_column("camera_settings", "profile", "TEXT")
-    ensure_column("camera_settings", "sensor_threshold_mm", "INTEGER")
-    ensure_column("camera_settings", "af_roi_norm", "TEXT")
+    # columns are backfilled once by init_db() at startup
     with db_conn() as db:
         cur = db.cursor()
-        cur.execute("""
-            SELECT camera_id, resolution, fps, bitrate_kbps, rotation, clip_duration_s, updated_at,
-                   profile, sensor_threshold_mm, af_roi_norm
-            FROM camera_settings WHERE camera_id = ?;
-        """, (camera_id,))
+        cur.execute(_SQL_GET_SETTINGS, (camera_id,))
         row = cur.fetchone()
-        if not row:
-            res, fps = _profile_to_res_fps(DEFAULT_PROFILE)
-            return {
-                "camera_id": camera_id,
-                "profile": DEFAULT_PROFILE,
-                "resolution": res,
-                "fps": fps,
-                "bitrate_kbps": PROFILES[DEFAULT_PROFILE]["default_bitrate_kbps"],
-                "rotation": 0,
-                "clip_duration_s": 5,
-                "sensor_threshold_mm": 1000,
-                "af_roi_norm": None,
-                "updated_at": None
-            }
-        profile = row[7] if len(row) > 7 and row[7] else DEFAULT_PROFILE
-        res = row[1] or _profile_to_res_fps(profile)[0]
-        fps = int(row[2]) if row[2] is not None else _profile_to_res_fps(profile)[1]
-        sensor_thr = int(row[8]) if len(row) > 8 and row[8] is not None else 1000
-        roi_norm = None
-        if len(row) > 9 and row[9]:
-            try:
-                val = pyjson.loads(row[9])
-                if isinstance(val, list) and len(val) == 4:
-                    roi_norm = [float(x) for x in val]
-            except Exception:
-                roi_norm = None
+    return _camera_settings_from_row(camera_id, row)
+
+def _camera_settings_from_row(camera_id: str, row) -> Dict[str, Any]:
+    if not row:
+        res, fps = _profile_to_res_fps(DEFAULT_PROFILE)
         return {
-            "camera_id": row[0],
-            "profile": profile,
+            "camera_id": camera_id,
+            "profile": DEFAULT_PROFILE,
             "resolution": res,
-            "fps": int(fps),
-            "bitrate_kbps": int(row[3]) if row[3] is not None else PROFILES[profile]["default_bitrate_kbps"],
-            "rotation": int(row[4]) if row[4] is not None else 0,
-            "clip_duration_s": int(row[5]) if row[5] is not None else 5,
-            "sensor_threshold_mm": sensor_thr,
-            "af_roi_norm": roi_norm,
-            "updated_at": row[6],
+            "fps": fps,
+            "bitrate_kbps": PROFILES[DEFAULT_PROFILE]["default_bitrate_kbps"],
+            "rotation": 0,
+            "clip_duration_s": 5,
+            "sensor_threshold_mm": 1000,
+            "af_roi_norm": None,
+            "updated_at": None
         }
+    # fps/bitrate/rotation/duration/threshold are INTEGER columns that only
+    # upsert_camera_settings writes (already int-coerced), so no re-casting here.
+    profile = row[7] if len(row) > 7 and row[7] else DEFAULT_PROFILE
+    res = row[1] or _profile_to_res_fps(profile)[0]
+    fps = row[2] if row[2] is not None else _profile_to_res_fps(profile)[1]
+    sensor_thr = row[8] if len(row) > 8 and row[8] is not None else 1000
+    roi_norm = None
+    if len(row) > 9 and row[9]:
+        try:
+            val = pyjson.loads(row[9])
+            if isinstance(val, list) and len(val) == 4:
+                roi_norm = [float(x) for x in val]
+        except Exception:
+            roi_norm = None
+    return {
+        "camera_id": row[0],
+        "profile": profile,
+        "resolution": res,
+        "fps": fps,
+        "bitrate_kbps": row[3] if row[3] is not None else PROFILES[profile]["default_bitrate_kbps"],
+        "rotation": row[4] if row[4] is not None else 0,
+        "clip_duration_s": row[5] if row[5] is not None else 5,
+        "sensor_threshold_mm": sensor_thr,
+        "af_roi_norm": roi_norm,
+        "updated_at": row[6],
+    }
 
-def upsert_camera_settings(payload: Dict[str, Any]) -> None:
-    now = datetime.now(timezone.utc).timestamp()
+def upsert_camera_settings(payload: Dict[str, Any]) -> bool:
+    """Insert/update one camera's settings in a single statement.
+
+    rotation, clip_duration_s, sensor_threshold_mm and af_roi_norm that are
+    missing/None keep the stored value (or the default for a new row).
+    Returns False when the row already held these values (nothing written).
+    """
+    now = time.time()
     cam_id = payload["camera_id"]
     profile = payload.get("profile") or DEFAULT_PROFILE
     if profile not in PROFILES:
         profile = DEFAULT_PROFILE
     br = _clamp_bitrate_for_profile(profile, payload.get("bitrate_kbps"))
-    try:
-        rot = int(payload.get("rotation", 0))
-    except Exception:
-        rot = 0
-    if rot not in (0,90,180,270):
-        rot = 0
-    try:
-        dur = int(payload.get("clip_duration_s", 5))
-    except Exception:
-        dur = 5
-    dur = max(2, min(600, dur))
-
-    try:
-        thr = payload.get("sensor_threshold_mm", 1000)
-        thr = int(thr if thr is not None else 1000)
-    except Exception:
-        thr = 1000
-    thr = max(30, min(4000, thr))
+    rot = payload.get("rotation")
+    if rot is not None:
+        rot = _coerce_int(rot, 0)
+        if rot not in _VALID_ROT:
+            rot = 0
+    dur = payload.get("clip_duration_s")
+    if dur is not None:
+        dur = _coerce_int(dur, 5, 2, 600)
+    thr = payload.get("sensor_threshold_mm")
+    if thr is not None:
+        thr = _coerce_int(thr, 1000, 30, 4000)
 
     # ROI (optional)
     roi_norm = payload.get("af_roi_norm", None)
@@ -854,66 +1320,67 @@ def upsert_camera_settings(payload: Dict[str, Any]) -> None:
 
     res, fps = _profile_to_res_fps(profile)
 
-    with db_conn() as db:
+    with db_writer() as db:
         cur = db.cursor()
-        cur.execute("""
-            INSERT INTO camera_settings (camera_id, resolution, fps, bitrate_kbps, rotation, clip_duration_s, updated_at, profile, sensor_threshold_mm, af_roi_norm)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            ON CONFLICT(camera_id) DO UPDATE SET
-              resolution=excluded.resolution,
-              fps=excluded.fps,
-              bitrate_kbps=excluded.bitrate_kbps,
-              rotation=excluded.rotation,
-              clip_duration_s=excluded.clip_duration_s,
-              updated_at=excluded.updated_at,
-              profile=excluded.profile,
-              sensor_threshold_mm=excluded.sensor_threshold_mm,
-              af_roi_norm=COALESCE(excluded.af_roi_norm, af_roi_norm);
-        """, (
-            cam_id, res, int(fps), int(br), int(rot), int(dur), now, profile, int(thr), roi_json
-        ))
+        cur.execute(_SQL_UPSERT_SETTINGS, {
+            "cam": cam_id, "res": res, "fps": int(fps), "br": int(br), "rot": rot, "dur": dur,
+            "now": now, "profile": profile, "thr": thr, "roi": roi_json,
+        })
         db.commit()
+        return cur.rowcount > 0
 
 def get_camera_endpoint(camera_id: str) -> Dict[str, Any]:
     with db_conn() as db:
         cur = db.cursor()
-        cur.execute("""
-            SELECT camera_id, ssh_host, ssh_user, config_path, service_name, updated_at
-            FROM camera_endpoints WHERE camera_id = ?;
-        """, (camera_id,))
+        cur.execute(_SQL_GET_ENDPOINT, (camera_id,))
         row = cur.fetchone()
-        if not row:
-            return {
-                "camera_id": camera_id,
-                "ssh_host": "",
-                "ssh_user": "pi",
-                "config_path": "/home/pi/camera_node/config.yaml",
-                "service_name": "camera-node",
-                "updated_at": None
-            }
+    return _camera_endpoint_from_row(camera_id, row)
+
+def _camera_endpoint_from_row(camera_id: str, row) -> Dict[str, Any]:
+    if not row:
         return {
-            "camera_id": row[0],
-            "ssh_host": row[1] or "",
-            "ssh_user": row[2] or "pi",
-            "config_path": row[3] or "/home/pi/camera_node/config.yaml",
-            "service_name": row[4] or "camera-node",
-            "updated_at": row[5],
+            "camera_id": camera_id,
+            "ssh_host": "",
+            "ssh_user": "pi",
+            "config_path": "/home/pi/camera_node/config.yaml",
+            "service_name": "camera-node",
+            "updated_at": None
         }
+    return {
+        "camera_id": row[0],
+        "ssh_host": row[1] or "",
+        "ssh_user": row[2] or "pi",
+        "config_path": row[3] or "/home/pi/camera_node/config.yaml",
+        "service_name": row[4] or "camera-node",
+        "updated_at": row[5],
+    }
 
-def upsert_camera_endpoint(payload: Dict[str, Any]) -> None:
-    now = datetime.now(timezone.utc).timestamp()
+def list_cameras_full() -> Tuple[List[str], Dict[str, Dict[str, Any]], Dict[str, Dict[str, Any]]]:
+    """(camera ids, endpoints by id, settings by id) in one query.
+
+    Same id set and order as list_camera_ids(); missing rows get the same
+    defaults as get_camera_endpoint()/get_camera_settings().
+    """
     with db_conn() as db:
         cur = db.cursor()
-        cur.execute("""
-            INSERT INTO camera_endpoints (camera_id, ssh_host, ssh_user, config_path, service_name, updated_at)
-            VALUES (?, ?, ?, ?, ?, ?)
-            ON CONFLICT(camera_id) DO UPDATE SET
-              ssh_host=excluded.ssh_host,
-              ssh_user=excluded.ssh_user,
-              config_path=excluded.config_path,
-              service_name=excluded.service_name,
-              updated_at=excluded.updated_at;
-        """, (
+        cur.execute(_SQL_CAMERAS_FULL)
+        rows = cur.fetchall()
+    cams: List[str] = []
+    endpoints: Dict[str, Dict[str, Any]] = {}
+    settings: Dict[str, Dict[str, Any]] = {}
+    for r in rows:
+        cam = r[0]
+        cams.append(cam)
+        endpoints[cam] = _camera_endpoint_from_row(cam, r[1:7] if r[1] is not None else None)
+        settings[cam] = _camera_settings_from_row(cam, r[7:17] if r[7] is not None else None)
+    return cams, endpoints, settings
+
+def upsert_camera_endpoint(payload: Dict[str, Any]) -> bool:
+    """Insert/update a camera's ssh endpoint; False when nothing changed."""
+    now = time.time()
+    with db_writer() as db:
+        cur = db.cursor()
+        cur.execute(_SQL_UPSERT_ENDPOINT, (
             payload["camera_id"],
             payload.get("ssh_host",""),
             payload.get("ssh_user","pi"),
@@ -922,29 +1389,47 @@ def upsert_camera_endpoint(payload: Dict[str, Any]) -> None:
             now
         ))
         db.commit()
+        return cur.rowcount > 0
 
 def _infer_profile_from_legacy(resolution: str, fps: int) -> str:
-    key = None
-    res = (resolution or "").lower().strip()
     try: fps_i = int(fps)
     except Exception: fps_i = 30
-    for name, p in PROFILES.items():
-        if p["resolution"].lower() == res and int(p["fps"]) == fps_i:
-            key = name
-            break
-    return key or DEFAULT_PROFILE
+    return _LEGACY_TO_PROFILE.get((_canon(resolution), fps_i), DEFAULT_PROFILE)
+
+# Successful node reads by (host, user, path) -> (monotonic ts, values), so quick
+# reloads of /config/cameras don't re-ssh every node. Dropped on push/import.
+NODE_YAML_TTL_SEC = 10.0
+_NODE_YAML_CACHE: Dict[Tuple[str, str, str], Tuple[float, Dict[str, Any]]] = {}
+_NODE_YAML_LOCK = threading.Lock()
+
+def _node_yaml_key(ep: Dict[str,str]) -> Tuple[str, str, str]:
+    return (ep.get("ssh_host") or "", ep.get("ssh_user") or "pi",
+            ep.get("config_path") or "/home/pi/camera_node/config.yaml")
+
+def invalidate_node_yaml(ep: Dict[str,str]) -> None:
+    with _NODE_YAML_LOCK:
+        _NODE_YAML_CACHE.pop(_node_yaml_key(ep), None)
 
 def read_node_recording_yaml(ep: Dict[str,str]) -> Tuple[Optional[Dict[str,Any]], Optional[str]]:
-    host = ep.get("ssh_host") or ""
-    user = ep.get("ssh_user") or "pi"
-    path = ep.get("config_path") or "/home/pi/camera_node/config.yaml"
+    key = _node_yaml_key(ep)
+    with _NODE_YAML_LOCK:
+        hit = _NODE_YAML_CACHE.get(key)
+    if hit and time.monotonic() - hit[0] < NODE_YAML_TTL_SEC:
+        return dict(hit[1]), None
+    out, err = _read_node_recording_yaml(*key)
+    if out is not None:
+        with _NODE_YAML_LOCK:
+            _NODE_YAML_CACHE[key] = (time.monotonic(), dict(out))
+    return out, err
+
+def _read_node_recording_yaml(host: str, user: str, path: str) -> Tuple[Optional[Dict[str,Any]], Optional[str]]:
     if not host:
         return None, "ssh_host not set"
     ok, text = _ssh_cat(user, host, path)
     if not ok:
         return None, text.strip() or "ssh read failed"
     try:
-        cfg = yaml.safe_load(text) or {}
+        cfg = yaml.load(text, Loader=YamlLoader) or {}
     except Exception as e:
         return None, f"parse failed: {e}"
 
@@ -982,25 +1467,11 @@ def read_node_recording_yaml(ep: Dict[str,str]) -> Tuple[Optional[Dict[str,Any]]
     if profile not in PROFILES:
         profile = DEFAULT_PROFILE
     bitrate = _clamp_bitrate_for_profile(profile, None if bitrate is None else int(bitrate))
-    try:
-        rotation = int(rotation if rotation is not None else 0)
-    except Exception:
-        rotation = 0
-    if rotation not in (0,90,180,270):
+    rotation = _coerce_int(rotation, 0)
+    if rotation not in _VALID_ROT:
         rotation = 0
-    try:
-        duration = int(duration if duration is not None else 5)
-    except Exception:
-        duration = 5
-    duration = max(2, min(600, duration))
-
-    try:
-        if sensor_threshold_mm is not None:
-            sensor_threshold_mm = int(sensor_threshold_mm)
-    except Exception:
-        sensor_threshold_mm = None
-    if sensor_threshold_mm is not None:
-        sensor_threshold_mm = max(30, min(4000, int(sensor_threshold_mm)))
+    duration = _coerce_int(duration, 5, 2, 600)
+    sensor_threshold_mm = _coerce_int(sensor_threshold_mm, None, 30, 4000)
 
     res, fps = _profile_to_res_fps(profile)
 
@@ -1021,19 +1492,22 @@ def read_node_recording_yaml(ep: Dict[str,str]) -> Tuple[Optional[Dict[str,Any]]
 
 @app.route("/config/cameras")
 def config_cameras_page():
-    cams = list_camera_ids()
+    cams, endpoints, settings = list_cameras_full()
     camera_rows = []
-    endpoints = {c: get_camera_endpoint(c) for c in cams}
+    # one ssh read per camera; run them side by side so the page waits ~max RTT
+    node_results = {}
+    if cams:
+        with ThreadPoolExecutor(max_workers=min(16, len(cams))) as ex:
+            node_results = dict(zip(cams, ex.map(read_node_recording_yaml, [endpoints[c] for c in cams])))
     for cam in cams:
-        ep = endpoints[cam]
-        node_vals, err = read_node_recording_yaml(ep)
+        node_vals, err = node_results[cam]
         if node_vals:
-            row = get_camera_settings(cam)
+            row = settings[cam]
             row.update(node_vals)
             row["source"] = "node"
             camera_rows.append(row)
         else:
-            row = get_camera_settings(cam)
+            row = settings[cam]
             row["source"] = "hub"
             row["node_error"] = err
             camera_rows.append(row)
@@ -1053,32 +1527,32 @@ def cameras_save():
     if profile not in PROFILES:
         return jsonify({"ok": False, "error": "invalid profile"}), 400
 
-    current = get_camera_settings(cam_id)
-
+    # Fields left out (or null) keep their stored values; the upsert COALESCEs them.
     try:
         br_in = data.get("bitrate_kbps", None)
         br = _clamp_bitrate_for_profile(profile, None if br_in is None else int(br_in))
-        rot = int(data.get("rotation", current.get("rotation", 0)))
-        dur = int(data.get("clip_duration_s", current.get("clip_duration_s", 5)))
+        rot = data.get("rotation")
+        rot = None if rot is None else int(rot)
+        dur = data.get("clip_duration_s")
+        dur = None if dur is None else int(dur)
     except Exception:
         return jsonify({"ok": False, "error": "invalid numeric field(s)"}), 400
-    if rot not in (0,90,180,270):
+    if rot is not None and rot not in _VALID_ROT:
         return jsonify({"ok": False, "error": "rotation must be one of 0,90,180,270"}), 400
-    if not (2 <= dur <= 600):
+    if dur is not None and not (2 <= dur <= 600):
         return jsonify({"ok": False, "error": "clip_duration_s out of range (2-600)"}), 400
 
     try:
-        thr_in = data.get("sensor_threshold_mm", current.get("sensor_threshold_mm", 1000))
-        thr = int(thr_in)
+        thr = data.get("sensor_threshold_mm")
+        thr = None if thr is None else int(thr)
     except Exception:
         return jsonify({"ok": False, "error": "sensor_threshold_mm must be an integer"}), 400
-    if not (30 <= thr <= 4000):
+    if thr is not None and not (30 <= thr <= 4000):
         return jsonify({"ok": False, "error": "sensor_threshold_mm out of range (30-4000)"}), 400
 
-    # Preserve existing ROI unless caller sends one
-    roi = data.get("af_roi_norm", current.get("af_roi_norm", None))
+    roi = data.get("af_roi_norm", None)
 
-    upsert_camera_settings({
+    changed = upsert_camera_settings({
         "camera_id": cam_id,
         "profile": profile,
         "bitrate_kbps": br,
@@ -1087,21 +1561,21 @@ def cameras_save():
         "sensor_threshold_mm": thr,
         "af_roi_norm": roi,
     })
-    return jsonify({"ok": True}), 200
+    return jsonify({"ok": True, "noop": not changed}), 200
 
 @app.route("/action/secure/cameras/save_endpoint", methods=["POST"])
 def cameras_save_endpoint():
     data = request.get_json(silent=True) or {}
     cam_id = (data.get("camera_id") or "").strip()
     if not cam_id: return jsonify({"ok": False, "error": "camera_id required"}), 400
-    upsert_camera_endpoint({
+    changed = upsert_camera_endpoint({
         "camera_id": cam_id,
         "ssh_host": (data.get("ssh_host") or "").strip(),
         "ssh_user": (data.get("ssh_user") or "pi").strip(),
         "config_path": (data.get("config_path") or "/home/pi/camera_node/config.yaml").strip(),
         "service_name": (data.get("service_name") or "camera-node").strip(),
     })
-    return jsonify({"ok": True}), 200
+    return jsonify({"ok": True, "noop": not changed}), 200
 
 @app.route("/action/secure/cameras/push", methods=["POST"])
 def cameras_push_to_node():
@@ -1115,9 +1589,10 @@ def cameras_push_to_node():
     ok, text = _ssh_cat(user, host, cfg_path)
     if not ok: return jsonify({"ok": False, "error": f"ssh read failed: {text.strip()}"}), 500
     try:
-        cfg = yaml.safe_load(text) or {}
+        cfg = yaml.load(text, Loader=YamlLoader) or {}
     except Exception as e:
         return jsonify({"ok": False, "error": f"parse remote YAML failed: {e}"}), 500
+    orig = copy.deepcopy(cfg)
 
     profile = cs.get("profile") or DEFAULT_PROFILE
     if profile not in PROFILES:
@@ -1149,8 +1624,13 @@ def cameras_push_to_node():
     if af_cfg:
         cfg["autofocus"] = af_cfg
 
-    new_text = yaml.safe_dump(cfg, sort_keys=False)
+    if cfg == orig:
+        # node already runs these settings: no write, no service restart
+        return jsonify({"ok": True, "noop": True}), 200
+
+    new_text = yaml.dump(cfg, Dumper=YamlDumper, sort_keys=False)
     ok, msg = _ssh_write_and_restart(user, host, cfg_path, new_text, svc)
+    invalidate_node_yaml(ep)
     if not ok: return jsonify({"ok": False, "error": f"ssh write/restart failed: {msg.strip()}"}), 500
     return jsonify({"ok": True}), 200
 
@@ -1173,7 +1653,7 @@ def cameras_forget():
     except Exception:
         pass
 
-    with db_conn() as db:
+    with db_writer() as db:
         db.execute("DELETE FROM nodes WHERE node_id=?", (cam_id,))
         db.execute("DELETE FROM node_tokens WHERE node_id=?", (cam_id,))
         db.execute("DELETE FROM camera_endpoints WHERE camera_id=?", (cam_id,))
@@ -1194,6 +1674,7 @@ def cameras_import_from_node():
     cam_id = (data.get("camera_id") or "").strip()
     if not cam_id: return jsonify({"ok": False, "error": "camera_id required"}), 400
     ep = get_camera_endpoint(cam_id)
+    invalidate_node_yaml(ep)  # import must see the node's current file
     node_vals, err = read_node_recording_yaml(ep)
     if not node_vals:
         return jsonify({"ok": False, "error": f"read node failed: {err or 'unknown'}"}), 500
@@ -1278,8 +1759,7 @@ def preview_save_roi():
 
 @app.route("/admin/tools")
 def admin_tools_page():
-    cams = list_camera_ids()
-    endpoints = {c: get_camera_endpoint(c) for c in cams}
+    cams, endpoints, _ = list_cameras_full()
     return render_template("admin_tools.html", cameras=cams, endpoints=endpoints, title="Admin Tools")
 
 @app.route("/action/secure/node/status", methods=["POST"])
@@ -1404,14 +1884,13 @@ def node_backup_config():
     if not host: return jsonify({"ok": False, "error": "ssh_host not set"}), 400
     ok, text = _ssh_cat(user, host, cfgp)
     if not ok: return jsonify({"ok": False, "error": text.strip() or "read failed"}), 500
-    resp = make_response(text)
-    resp.headers["Content-Type"] = "text/yaml"
-    fn = f"{cam}_config_{datetime.utcnow().strftime('%Y%m%dT%H%M%SZ')}.yaml"
-    resp.headers["Content-Disposition"] = f'attachment; filename="{fn}"'
-    return resp
+    fn = f"{cam}_config_{datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%SZ')}.yaml"
+    return send_file(io.BytesIO(text.encode("utf-8")), mimetype="text/yaml",
+                     as_attachment=True, download_name=fn)
 
 # -------------------- Startup --------------------
 init_db()
+threading.Thread(target=_clips_index_worker, name="clips-index", daemon=True).start()
 
 if __name__ == "__main__":
     app.run(host="127.0.0.1", port=8080)
@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import json
+import os
+from pathlib import Path
+
+import yaml
+try:
+    from yaml import CSafeLoader as YamlLoader  # libyaml-backed when available
+except ImportError:
+    from yaml import SafeLoader as YamlLoader
+
+# On-disk JSON copy of the parsed config, so a restarted worker (or the next
+# thumbs.py run) skips YAML parsing. Named by the source's (mtime_ns, size).
+CFG_JSON_CACHE_DIR = Path.home() / ".cache" / "vcnode"
+
+def _cache_path(st: os.stat_result) -> Path:
+    return CFG_JSON_CACHE_DIR / f"config.{st.st_mtime_ns}.{st.st_size}.json"
+
+def _write_json_cache(cache: Path, data: dict) -> None:
+    text = json.dumps(data)
+    if json.loads(text) != data:
+        return  # not JSON-safe (dates, non-str keys): keep parsing YAML
+    CFG_JSON_CACHE_DIR.mkdir(mode=0o700, parents=True, exist_ok=True)
+    tmp = cache.with_name(f"{cache.name}.{os.getpid()}.tmp")
+    # 0600: the config carries auth tokens, don't widen who can read them
+    fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, "w") as f:
+        f.write(text)
+    os.replace(tmp, cache)
+    for old in CFG_JSON_CACHE_DIR.glob("config.*.json"):
+        if old != cache:
+            try:
+                old.unlink()
+            except OSError:
+                pass
+
+def load_yaml_cached(path: Path) -> dict:
+    """Parse a YAML file, reusing the JSON cache written for its current (mtime_ns, size)."""
+    path = Path(path)
+    cache = _cache_path(path.stat())
+    try:
+        with open(cache, "r") as f:
+            data = json.load(f)
+        if isinstance(data, dict):
+            return data
+    except (OSError, ValueError):
+        pass
+    with open(path, "r") as f:
+        data = yaml.load(f, Loader=YamlLoader) or {}
+    try:
+        _write_json_cache(cache, data)
+    except (OSError, TypeError, ValueError):
+        pass  # unwritable cache dir: just parse YAML next time too
+    return data
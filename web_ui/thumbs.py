@@ -1,16 +1,24 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 
-import os, subprocess, sys
+import json, os, subprocess, sys, time
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-import yaml
-from datetime import datetime
+from datetime import datetime, timezone
+
+from cfg_cache import load_yaml_cached
 
 HUB_CFG = Path(os.environ.get("HUB_SERVER_CONFIG", str(Path.home()/ "hub_server" / "config.yaml")))
 if not HUB_CFG.exists():
     print(f"[thumbs] missing hub config at {HUB_CFG}", file=sys.stderr); sys.exit(1)
 
-cfg = yaml.safe_load(open(HUB_CFG, "r")) or {}
+try:  # optional: in-process decode, no ffmpeg fork/exec per clip
+    import av
+    import PIL.Image  # frame.to_image() needs Pillow; without it fall back to batched ffmpeg
+except ImportError:
+    av = None
+
+cfg = load_yaml_cached(HUB_CFG)
 storage = cfg.get("storage", {}) or {}
 base_dir = storage.get("base_dir", "/home/pi/data")
 clips_subdir = storage.get("clips_subdir", "clips")
@@ -20,32 +28,164 @@ def pick_timecode(video_path: Path) -> str:
     # simple: use 1s in — good enough for 5s clips
     return "00:00:01"
 
+THUMB_AT_S = 1.0
+THUMB_WIDTH = 320  # cards show thumbs small; no need to encode full-HD JPEGs
+
+def _make_thumb_av(video: Path, thumb: Path) -> bool:
+    """Decode the frame at THUMB_AT_S (or the last one, for shorter clips) with PyAV."""
+    try:
+        with av.open(str(video)) as container:
+            stream = container.streams.video[0]
+            if stream.time_base:
+                container.seek(int(THUMB_AT_S / stream.time_base), stream=stream)
+            frame = None
+            for frame in container.decode(stream):
+                if frame.time is None or frame.time >= THUMB_AT_S:
+                    break
+            if frame is None:
+                return False
+            if frame.width > THUMB_WIDTH:
+                h = max(2, round(frame.height * THUMB_WIDTH / frame.width / 2) * 2)
+                frame = frame.reformat(width=THUMB_WIDTH, height=h)
+            frame.to_image().save(str(thumb), "JPEG", quality=80)
+        return True
+    except Exception:
+        return False
+
 def make_thumb(video: Path, thumb: Path) -> bool:
     thumb.parent.mkdir(parents=True, exist_ok=True)
-    t = pick_timecode(video)
-    cmd = ["ffmpeg", "-y", "-ss", t, "-i", str(video), "-frames:v", "1", str(thumb)]
+    if av is not None and _make_thumb_av(video, thumb):
+        return True
+    cmd = ["ffmpeg", "-y", *_ffmpeg_input_args(video), *_ffmpeg_output_args(thumb)]
     try:
         subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=True)
         return True
     except subprocess.CalledProcessError:
         return False
 
-def scan_and_build():
-    built = 0
-    for mp4 in CLIPS_DIR.rglob("*.mp4"):
-        jpg = mp4.with_suffix(".jpg")
-        if not jpg.exists():
-            if make_thumb(mp4, jpg):
-                built += 1
+def _ffmpeg_input_args(video: Path):
+    return ["-probesize", "512k", "-analyzeduration", "0",
+            "-ss", pick_timecode(video), "-i", str(video)]
+
+def _ffmpeg_output_args(thumb: Path):
+    return ["-frames:v", "1", "-vf", f"scale='min({THUMB_WIDTH},iw)':-2", "-q:v", "5", str(thumb)]
+
+THUMB_BATCH = 16  # clips per ffmpeg process
+
+def make_thumbs_batch(pairs) -> int:
+    """Thumbnail several clips with one ffmpeg process (N inputs -> N outputs).
+
+    If the batch command fails (e.g. one corrupt clip), every clip is
+    retried on its own so the good ones still get a thumbnail.
+    """
+    if av is not None or len(pairs) == 1:
+        return sum(1 for pair in pairs if make_thumb(*pair))
+    cmd = ["ffmpeg", "-y"]
+    for video, thumb in pairs:
+        thumb.parent.mkdir(parents=True, exist_ok=True)
+        cmd += _ffmpeg_input_args(video)
+    for i, (_, thumb) in enumerate(pairs):
+        cmd += ["-map", f"{i}:v:0", *_ffmpeg_output_args(thumb)]
+    try:
+        subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=True)
+        return sum(1 for _, thumb in pairs if thumb.exists())
+    except subprocess.CalledProcessError:
+        return sum(1 for pair in pairs if make_thumb(*pair))
+
+# Start time of the last completed scan, minus SCAN_SLACK_NS. Every directory is
+# still listed (scandir) to find subdirectories, but the files of one not modified
+# since then (no clip added or removed) are not compared against thumbnails.
+STATE_FILE = CLIPS_DIR / ".thumbs_state.json"
+# Re-check directories touched up to this long before the last scan started:
+# directory mtimes are coarse, and an update in the same tick as the scan's start
+# would otherwise never compare newer.
+SCAN_SLACK_NS = 5 * 1_000_000_000
+
+def _load_state():
+    """(last_scan_ns, stems whose thumbnail failed last run)."""
+    try:
+        with open(STATE_FILE, "r") as f:
+            state = json.load(f)
+        return int(state.get("last_scan_ns", 0)), set(state.get("failed", []))
+    except (OSError, ValueError, TypeError, AttributeError):
+        return 0, set()
+
+def _save_state(ns: int, failed) -> None:
+    try:
+        tmp = STATE_FILE.with_name(f"{STATE_FILE.name}.{os.getpid()}.tmp")
+        with open(tmp, "w") as f:
+            json.dump({"last_scan_ns": ns, "failed": sorted(failed)}, f)
+        os.replace(tmp, STATE_FILE)
+    except OSError as e:
+        print(f"[thumbs] could not save scan state: {e}", file=sys.stderr)
+
+def _changed_dirs(root: str, since_ns: int):
+    """Yield directories under root (inclusive) modified after since_ns.
+
+    Still scandirs every directory to find its subdirectories; only the
+    per-file mp4/jpg comparison is skipped for unchanged ones.
+    """
+    try:
+        if os.stat(root).st_mtime_ns > since_ns:
+            yield root
+        with os.scandir(root) as it:
+            subdirs = [e.path for e in it if e.is_dir(follow_symlinks=False)]
+    except OSError:
+        return
+    for d in subdirs:
+        yield from _changed_dirs(d, since_ns)
+
+def _stems(d: str):
+    """(mp4 stems, jpg stems) of the files directly in d; one listing, no stat calls."""
+    mp4s, jpgs = set(), set()
+    try:
+        with os.scandir(d) as it:
+            for e in it:
+                if e.name.endswith(".mp4"):
+                    mp4s.add(e.path[:-4])
+                elif e.name.endswith(".jpg"):
+                    jpgs.add(e.path[:-4])
+    except OSError:
+        pass
+    return mp4s, jpgs
+
+def scan_and_build(jobs: int = 0, full: bool = False):
+    started_ns = time.time_ns()
+    since_ns, failed = _load_state()
+    if full:
+        since_ns = 0
+    # Failures are retried even if their directory hasn't changed since (e.g. a
+    # clip still being written when it was first seen).
+    todo = {stem for stem in failed
+            if os.path.exists(stem + ".mp4") and not os.path.exists(stem + ".jpg")}
+    for d in _changed_dirs(str(CLIPS_DIR), since_ns):
+        mp4s, jpgs = _stems(d)
+        todo |= mp4s - jpgs
+    pairs = [(Path(stem + ".mp4"), Path(stem + ".jpg")) for stem in sorted(todo)]
+    built = _build(pairs, jobs)
+    failed = {stem for stem in todo if not os.path.exists(stem + ".jpg")}
+    _save_state(started_ns - SCAN_SLACK_NS, failed)
     return built
 
+def _build(pairs, jobs: int) -> int:
+    if not pairs:
+        return 0
+    jobs = jobs or os.cpu_count() or 1
+    # small enough batches that every worker gets one
+    size = max(1, min(THUMB_BATCH, -(-len(pairs) // jobs)))
+    batches = [pairs[i:i + size] for i in range(0, len(pairs), size)]
+    if jobs <= 1 or len(batches) <= 1:
+        return sum(make_thumbs_batch(b) for b in batches)
+    with ProcessPoolExecutor(max_workers=min(jobs, len(batches))) as ex:
+        return sum(ex.map(make_thumbs_batch, batches))
+
 def prune_orphans():
     removed = 0
-    for jpg in CLIPS_DIR.rglob("*.jpg"):
-        mp4 = jpg.with_suffix(".mp4")
-        if not mp4.exists():
+    for d in _changed_dirs(str(CLIPS_DIR), -1):  # every directory
+        mp4s, jpgs = _stems(d)
+        for stem in jpgs - mp4s:
             try:
-                jpg.unlink()
+                os.unlink(stem + ".jpg")
                 removed += 1
             except Exception:
                 pass
@@ -53,9 +193,15 @@ def prune_orphans():
 
 def main():
     do_prune = ("--prune" in sys.argv)
-    built = scan_and_build()
+    jobs = 0  # 0 = one worker per CPU
+    if "--jobs" in sys.argv:
+        try:
+            jobs = int(sys.argv[sys.argv.index("--jobs") + 1])
+        except (IndexError, ValueError):
+            print("[thumbs] --jobs needs an integer", file=sys.stderr); sys.exit(2)
+    built = scan_and_build(jobs, full=("--full" in sys.argv))
     removed = prune_orphans() if do_prune else 0
-    print(f"[thumbs] built={built} removed={removed} at {datetime.utcnow().isoformat()}Z")
+    print(f"[thumbs] built={built} removed={removed} at {datetime.now(timezone.utc).isoformat().replace('+00:00', 'Z')}")
 
 if __name__ == "__main__":
     main()